@@ -13,6 +13,10 @@ Repository: https://github.com/yourusername/ai-content-detector
 
 import sys
 import os
+import glob
+import json
+import time
+import argparse
 
 # Add parent directory to path so we can import src
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -23,21 +27,39 @@ if sys.platform == "win32":
     sys.stdout = codecs.getwriter("utf-8")(sys.stdout.detach())
 
 from src.core.detector import AIContentDetector
-from src.utils.console import print_result, print_initialization_status
+from src.core.batch import BatchStats, analyze_paths, iter_paths
+from src.core.cache import VerdictCache
+from src.utils.console import print_result, print_initialization_status, print_batch_line, print_batch_summary
 
 
-def main():
-    """CLI interface"""
-    if len(sys.argv) < 2:
-        print("Usage: python ai_content_detector.py <file_path>")
-        print("\nExample:")
-        print("  python ai_content_detector.py examples/ChatGPT_Image.png")
-        sys.exit(1)
-    
-    file_path = sys.argv[1]
-    
+def parse_args():
+    """Parse command line arguments"""
+    parser = argparse.ArgumentParser(
+        description="Detect AI-generated content using C2PA and image detection",
+        epilog="Examples:\n"
+               "  python bin/detector.py examples/ChatGPT_Image.png\n"
+               "  python bin/detector.py examples/ --jobs 8\n"
+               "  python bin/detector.py \"archive/**/*.jpg\" --json > results.ndjson",
+        formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("paths", nargs="*", help="Files, directories or glob patterns")
+    parser.add_argument("--from-file", metavar="LIST", help="Read paths from a file, one per line ('-' for stdin)")
+    parser.add_argument("-j", "--jobs", type=int, default=None, help="Worker processes for batch mode (default: CPU count)")
+    parser.add_argument("--api", metavar="URL", default=None, help="C2PA API server endpoint (default: http://localhost:8000; "
+                        "local endpoints and 'none' validate in-process)")
+    parser.add_argument("--batch-size", type=int, default=8, help="Images per batched model call (default: 8)")
+    parser.add_argument("--cache", metavar="DB", default=None, help="SQLite verdict cache shared by all workers")
+    parser.add_argument("--json", action="store_true", help="Print one JSON result per line")
+    parser.add_argument("--timings", action="store_true", help="Add per-stage timings to each result")
+    parser.add_argument("-v", "--verbose", action="store_true", help="Print full results in batch mode")
+    return parser.parse_args()
+
+
+def run_single(args, file_path: str):
+    """Analyze one file with full output"""
     print("Initializing AI Content Detector...")
-    detector = AIContentDetector()
+    cache = VerdictCache(db_path=args.cache) if args.cache else None
+    detector = AIContentDetector(args.api, cache=cache, timings=args.timings)
     
     # Print initialization status
     print_initialization_status(
@@ -50,5 +72,49 @@ def main():
     print_result(result)
 
 
+def run_batch(args):
+    """Analyze many files in parallel, streaming results as they finish"""
+    paths = iter_paths(args.paths, args.from_file)
+    stats = BatchStats()
+    start = time.monotonic()
+    
+    for result in analyze_paths(paths, jobs=args.jobs, api_endpoint=args.api,
+                                cache_path=args.cache, batch_size=args.batch_size,
+                                timings=args.timings):
+        stats.add(result)
+        if args.json:
+            print(json.dumps(result, default=str), flush=True)
+        elif args.verbose:
+            print_result(result)
+        else:
+            print_batch_line(result)
+    
+    summary = stats.summary(time.monotonic() - start)
+    if args.json:
+        print(json.dumps({"summary": summary}), file=sys.stderr)
+    else:
+        print_batch_summary(summary)
+
+
+def main():
+    """CLI interface"""
+    args = parse_args()
+    
+    if not args.paths and not args.from_file:
+        print("Usage: python bin/detector.py <file_path> [more paths...] [--jobs N]")
+        print("\nExample:")
+        print("  python bin/detector.py examples/ChatGPT_Image.png")
+        print("  python bin/detector.py examples/ --jobs 4")
+        sys.exit(1)
+    
+    # A single plain file keeps the detailed report
+    single = (len(args.paths) == 1 and not args.from_file and not args.json
+              and not os.path.isdir(args.paths[0]) and not glob.has_magic(args.paths[0]))
+    if single:
+        run_single(args, args.paths[0])
+    else:
+        run_batch(args)
+
+
 if __name__ == "__main__":
     main()
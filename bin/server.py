@@ -29,35 +29,82 @@ except ImportError:
     print("pip install fastapi uvicorn c2pa-python")
     sys.exit(1)
 
+import argparse
+
 from src.api.server import create_app
 from src.api.routes import setup_routes
+from src.api.runner import serve
+
+
+def parse_args():
+    """Parse command line arguments (defaults come from the environment)"""
+    env = os.environ.get
+    
+    parser = argparse.ArgumentParser(description="C2PA Verification API Server")
+    parser.add_argument("--host", default=env("C2PA_API_HOST", "0.0.0.0"),
+                        help="Interface to bind (env C2PA_API_HOST)")
+    parser.add_argument("--port", type=int, default=int(env("C2PA_API_PORT", 8000)),
+                        help="Port to bind (env C2PA_API_PORT)")
+    parser.add_argument("-w", "--workers", type=int, default=int(env("C2PA_API_PROCESSES", 1)),
+                        help="Worker processes (env C2PA_API_PROCESSES, default 1)")
+    parser.add_argument("--max-requests", type=int, default=int(env("C2PA_API_MAX_REQUESTS", 0)),
+                        help="Recycle a worker after this many requests, 0 = never (env C2PA_API_MAX_REQUESTS)")
+    parser.add_argument("--max-requests-jitter", type=int,
+                        default=int(env("C2PA_API_MAX_REQUESTS_JITTER", 0)),
+                        help="Random extra requests before recycling (env C2PA_API_MAX_REQUESTS_JITTER)")
+    parser.add_argument("--graceful-timeout", type=int, default=int(env("C2PA_API_GRACEFUL_TIMEOUT", 30)),
+                        help="Seconds to finish in-flight requests on shutdown (env C2PA_API_GRACEFUL_TIMEOUT)")
+    parser.add_argument("--server", choices=["auto", "gunicorn", "uvicorn"],
+                        default=env("C2PA_API_SERVER", "auto"),
+                        help="Process manager for multiple workers (env C2PA_API_SERVER)")
+    parser.add_argument("--log-level", default=env("C2PA_API_LOG_LEVEL", "info"),
+                        help="Server log level (env C2PA_API_LOG_LEVEL)")
+    return parser.parse_args()
 
 
 def main():
     """Run the API server"""
+    args = parse_args()
+    
     # Create app
     app = create_app()
     
     # Setup routes
     setup_routes(app)
     
+    # Compile the marker scanner now so forked workers share it
+    app.state.platform_registry.compile()
+    
     # Print startup info
     print("="*60)
     print("C2PA Verification API Server v2.0 (Modular)")
     print("="*60)
     print(f"\nSupported Platforms: {', '.join(app.state.platform_registry.get_all_platforms())}")
-    print("\nStarting server at http://localhost:8000")
+    print(f"\nStarting server at http://{args.host}:{args.port} ({args.workers} worker process(es))")
     print("\nEndpoints:")
     print("  - POST /validate/file    (upload file)")
     print("  - POST /validate/base64  (send base64 data)")
+    print("  - POST /validate/raw     (send raw bytes)")
     print("  - POST /validate/url     (validate from URL)")
+    print("  - POST /validate/batch   (many assets, ?stream=true for NDJSON)")
     print("  - GET  /platforms        (list platforms)")
     print("  - GET  /health           (health check)")
-    print("\nAPI Docs: http://localhost:8000/docs")
+    print("  - GET  /metrics          (Prometheus metrics)")
+    print(f"\nAPI Docs: http://{args.host}:{args.port}/docs")
     print("="*60 + "\n")
     
     # Run server
-    uvicorn.run(app, host="0.0.0.0", port=8000, log_level="info")
+    serve(
+        app,
+        host=args.host,
+        port=args.port,
+        workers=max(1, args.workers),
+        max_requests=args.max_requests,
+        max_requests_jitter=args.max_requests_jitter,
+        graceful_timeout=args.graceful_timeout,
+        server=args.server,
+        log_level=args.log_level
+    )
 
 
 if __name__ == "__main__":
@@ -0,0 +1,109 @@
+"""
+Request Coalescing
+Singleflight sharing of one in-flight validation between identical requests
+"""
+
+import asyncio
+import hashlib
+from typing import Any, Awaitable, Callable, Dict, Tuple
+from urllib.parse import urlsplit, urlunsplit
+
+
+# Payloads above this size are hashed off the event loop
+_INLINE_HASH_BYTES = 1024 * 1024
+
+_DEFAULT_PORTS = {"http": 80, "https": 443}
+
+
+async def content_key(data: bytes) -> str:
+    """
+    Coalescing key for file bytes
+    
+    Args:
+        data: File bytes
+        
+    Returns:
+        SHA-256 hex digest
+    """
+    if len(data) <= _INLINE_HASH_BYTES:
+        return hashlib.sha256(data).hexdigest()
+    return await asyncio.to_thread(lambda: hashlib.sha256(data).hexdigest())
+
+
+def normalize_url(url: str) -> str:
+    """
+    Canonical form of a URL for coalescing and caching
+    
+    Lowercases the scheme and host, drops default ports and the fragment;
+    the path and query are kept as-is since they select the asset.
+    
+    Args:
+        url: Asset URL
+        
+    Returns:
+        Normalized URL
+    """
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or "").lower()
+    if ":" in host:
+        host = f"[{host}]"
+    if parts.port and parts.port != _DEFAULT_PORTS.get(scheme):
+        host = f"{host}:{parts.port}"
+    if parts.username:
+        credentials = parts.username + (f":{parts.password}" if parts.password else "")
+        host = f"{credentials}@{host}"
+    return urlunsplit((scheme, host, parts.path or "/", parts.query, ""))
+
+
+class SingleFlight:
+    """
+    Run one computation per key at a time
+    
+    Callers that arrive while a computation for their key is running wait
+    for it and share its result (or exception) instead of starting their
+    own. The computation runs as its own task, so it still completes for
+    the waiters if the caller that started it disconnects. Results are
+    shared objects and must not be mutated.
+    """
+    
+    def __init__(self):
+        self._calls: Dict[str, asyncio.Task] = {}
+        self.shared = 0
+    
+    @property
+    def in_flight(self) -> int:
+        """Distinct computations running"""
+        return len(self._calls)
+    
+    async def do(self, key: str, fn: Callable[[], Awaitable[Any]]) -> Tuple[Any, bool]:
+        """
+        Run fn for key, or join the run already in flight
+        
+        Args:
+            key: Identity of the computation
+            fn: Coroutine function producing the result
+            
+        Returns:
+            Tuple of (result, shared) where shared is True if another
+            request's computation was joined
+        """
+        task = self._calls.get(key)
+        shared = task is not None
+        
+        if task is None:
+            task = asyncio.ensure_future(fn())
+            self._calls[key] = task
+            task.add_done_callback(lambda done: self._finish(key, done))
+        else:
+            self.shared += 1
+            
+        return await asyncio.shield(task), shared
+    
+    def _finish(self, key: str, task: asyncio.Task):
+        """Forget a finished computation"""
+        if self._calls.get(key) is task:
+            del self._calls[key]
+        # Mark the exception retrieved in case every caller has gone away
+        if not task.cancelled():
+            task.exception()
@@ -0,0 +1,85 @@
+"""
+Bounded Executor
+Runs blocking C2PA work off the event loop with admission control
+"""
+
+import os
+import asyncio
+import functools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Optional
+
+from fastapi import HTTPException
+
+
+class ExecutorSaturated(HTTPException):
+    """Raised when the work queue is full; FastAPI answers 503 with Retry-After"""
+    
+    def __init__(self, retry_after: int = 1):
+        super().__init__(
+            status_code=503,
+            detail="Server busy, retry later",
+            headers={"Retry-After": str(retry_after)}
+        )
+
+
+class BoundedExecutor:
+    """
+    Thread pool for blocking work with a bounded queue
+    
+    c2pa parsing and validation, file I/O and marker scanning run on the
+    pool so the event loop keeps serving other requests. When all workers
+    are busy and the queue is full, new work is rejected immediately
+    instead of letting latency grow without limit.
+    """
+    
+    def __init__(self, max_workers: Optional[int] = None, max_queue: Optional[int] = None):
+        """
+        Args:
+            max_workers: Worker threads (env C2PA_API_WORKERS, default CPU count)
+            max_queue: Jobs allowed to wait for a worker (env C2PA_API_QUEUE, default 4x workers)
+        """
+        self.max_workers = max_workers or int(os.environ.get("C2PA_API_WORKERS", 0)) or os.cpu_count() or 1
+        if max_queue is None:
+            max_queue = int(os.environ.get("C2PA_API_QUEUE", self.max_workers * 4))
+        self.max_queue = max_queue
+        
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="c2pa-worker")
+        self._in_flight = 0
+        self._lock = threading.Lock()
+    
+    @property
+    def in_flight(self) -> int:
+        """Jobs running or waiting"""
+        return self._in_flight
+    
+    async def run(self, fn: Callable, *args, **kwargs):
+        """
+        Run a blocking function on the pool
+        
+        Args:
+            fn: Function to call
+            *args, **kwargs: Arguments for fn
+            
+        Returns:
+            Return value of fn
+            
+        Raises:
+            ExecutorSaturated: If all workers are busy and the queue is full
+        """
+        with self._lock:
+            if self._in_flight >= self.max_workers + self.max_queue:
+                raise ExecutorSaturated()
+            self._in_flight += 1
+        
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._executor, functools.partial(fn, *args, **kwargs))
+        finally:
+            with self._lock:
+                self._in_flight -= 1
+    
+    def shutdown(self, wait: bool = True):
+        """Stop the worker threads"""
+        self._executor.shutdown(wait=wait)
@@ -0,0 +1,152 @@
+"""
+URL Fetcher
+Streams remote assets over pooled keep-alive connections with a size cap
+"""
+
+import asyncio
+import os
+from typing import Dict, Optional
+
+from fastapi import HTTPException
+
+from ..core.locator import detect_container, manifest_prefix
+
+# Smallest growth of the buffer between two manifest checks
+PREFIX_CHECK_BYTES = 64 * 1024
+
+
+class PayloadTooLarge(HTTPException):
+    """Raised when a remote asset exceeds the download cap"""
+    
+    def __init__(self, max_bytes: int):
+        super().__init__(
+            status_code=413,
+            detail=f"Remote file exceeds the {max_bytes} byte limit"
+        )
+
+
+class FetchResult:
+    """Outcome of a URL fetch"""
+    
+    def __init__(self, data: Optional[bytes], content_type: Optional[str] = None,
+                 partial: bool = False, headers: Optional[Dict[str, str]] = None,
+                 not_modified: bool = False):
+        """
+        Args:
+            data: Body bytes (None for a 304)
+            content_type: MIME type from the Content-Type header
+            partial: True if the download stopped after the manifest
+            headers: Response headers
+            not_modified: True if the server answered 304 to a conditional GET
+        """
+        self.data = data
+        self.content_type = content_type
+        self.partial = partial
+        self.not_modified = not_modified
+        
+        # Validators for revalidating a cached result (none if caching is forbidden)
+        headers = headers or {}
+        cacheable = "no-store" not in headers.get("Cache-Control", "").lower()
+        self.etag = headers.get("ETag") if cacheable else None
+        self.last_modified = headers.get("Last-Modified") if cacheable else None
+
+
+class URLFetcher:
+    """
+    Async downloader for /validate/url
+    
+    One httpx.AsyncClient is shared by all requests, so repeated URLs from
+    the same CDN reuse warm connections. Bodies are streamed and the
+    download stops as soon as the manifest store and the start of the
+    media payload behind it have arrived.
+    """
+    
+    def __init__(self, max_bytes: Optional[int] = None, timeout: Optional[float] = None,
+                 max_connections: int = 100, max_keepalive: int = 20):
+        """
+        Args:
+            max_bytes: Largest body read (env C2PA_API_MAX_URL_BYTES, default 100 MB)
+            timeout: Seconds allowed per network operation (env C2PA_API_FETCH_TIMEOUT)
+            max_connections: Connections open at once across all hosts
+            max_keepalive: Idle connections kept for reuse
+        """
+        self.max_bytes = max_bytes or int(os.environ.get("C2PA_API_MAX_URL_BYTES", 100 * 1024 * 1024))
+        self.timeout = timeout or float(os.environ.get("C2PA_API_FETCH_TIMEOUT", 30))
+        self.max_connections = max_connections
+        self.max_keepalive = max_keepalive
+        self._client = None
+    
+    def _get_client(self):
+        """Create the pooled client on first use (inside the running loop)"""
+        if self._client is None:
+            import httpx
+            
+            self._client = httpx.AsyncClient(
+                timeout=httpx.Timeout(self.timeout, connect=min(self.timeout, 5.0)),
+                limits=httpx.Limits(max_connections=self.max_connections,
+                                    max_keepalive_connections=self.max_keepalive),
+                follow_redirects=True
+            )
+        return self._client
+    
+    async def fetch(self, url: str, etag: Optional[str] = None,
+                    last_modified: Optional[str] = None) -> FetchResult:
+        """
+        Download a URL, stopping early once the manifest has been read
+        
+        Args:
+            url: Remote asset URL
+            etag: ETag of a cached copy (sends If-None-Match)
+            last_modified: Last-Modified of a cached copy (sends If-Modified-Since)
+            
+        Returns:
+            FetchResult; partial data is a closed-off copy of the asset
+            holding its full manifest store
+            
+        Raises:
+            PayloadTooLarge: If the body is larger than max_bytes
+        """
+        client = self._get_client()
+        
+        headers = {}
+        if etag:
+            headers["If-None-Match"] = etag
+        if last_modified:
+            headers["If-Modified-Since"] = last_modified
+            
+        async with client.stream("GET", url, headers=headers) as response:
+            if response.status_code == 304 and headers:
+                return FetchResult(None, headers=response.headers, not_modified=True)
+            response.raise_for_status()
+            
+            content_type = response.headers.get("Content-Type", "").split(";")[0].strip() or None
+            declared = response.headers.get("Content-Length")
+            if declared and declared.isdigit() and int(declared) > self.max_bytes:
+                raise PayloadTooLarge(self.max_bytes)
+                
+            buffer = bytearray()
+            walkable = None
+            next_check = 0
+            
+            async for chunk in response.aiter_bytes():
+                buffer += chunk
+                if len(buffer) > self.max_bytes:
+                    raise PayloadTooLarge(self.max_bytes)
+                    
+                if walkable is None and len(buffer) >= 12:
+                    walkable = detect_container(buffer) is not None
+                if walkable and len(buffer) >= next_check:
+                    # Each walk starts at offset 0, so wait until the buffer has
+                    # doubled (keeps the total linear) and walk off the event loop
+                    prefix = await asyncio.to_thread(manifest_prefix, buffer)
+                    if prefix is not None:
+                        return FetchResult(prefix, content_type, True, response.headers)
+                    next_check = max(2 * len(buffer), len(buffer) + PREFIX_CHECK_BYTES)
+                        
+            return FetchResult(bytes(buffer), content_type, False, response.headers)
+    
+    async def close(self):
+        """Close pooled connections"""
+        client, self._client = self._client, None
+        if client is not None:
+            await client.aclose()
@@ -0,0 +1,278 @@
+"""
+API Metrics
+Lightweight Prometheus-style counters, gauges and histograms for the API server
+"""
+
+import time
+import threading
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+
+# Seconds; validation stages range from microseconds (scans) to seconds (large parses)
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1,
+                   0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Bytes, 1 KB to 256 MB
+SIZE_BUCKETS = tuple(1024 * 4 ** i for i in range(10))
+
+
+def _format_labels(names: Tuple[str, ...], values: Tuple[str, ...], extra: str = "") -> str:
+    """Render a Prometheus label set"""
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _escape(value) -> str:
+    """Escape a label value"""
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_value(value: float) -> str:
+    """Render a sample value"""
+    if value == float("inf"):
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class _Metric:
+    """Shared label handling"""
+    
+    kind = "untyped"
+    
+    def __init__(self, name: str, help_text: str, labels: Iterable[str] = ()):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = tuple(labels)
+        self._lock = threading.Lock()
+    
+    def _key(self, labels: Dict[str, str]) -> Tuple[str, ...]:
+        """Label values in declaration order"""
+        return tuple(str(labels.get(name, "")) for name in self.label_names)
+    
+    def header(self) -> List[str]:
+        """HELP and TYPE lines"""
+        return [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} {self.kind}"]
+
+
+class Counter(_Metric):
+    """Monotonically increasing count"""
+    
+    kind = "counter"
+    
+    def __init__(self, name: str, help_text: str, labels: Iterable[str] = ()):
+        super().__init__(name, help_text, labels)
+        self._values = {}
+    
+    def inc(self, amount: float = 1, **labels):
+        """Add to the counter for a label set"""
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+    
+    def value(self, **labels) -> float:
+        """Current value for a label set"""
+        return self._values.get(self._key(labels), 0)
+    
+    def render(self) -> List[str]:
+        """Render as Prometheus text lines"""
+        with self._lock:
+            items = sorted(self._values.items())
+        return self.header() + [
+            f"{self.name}{_format_labels(self.label_names, key)} {_format_value(value)}"
+            for key, value in items
+        ]
+
+
+class Gauge(_Metric):
+    """Value that goes up and down, or is read from a callback at scrape time"""
+    
+    kind = "gauge"
+    
+    def __init__(self, name: str, help_text: str, labels: Iterable[str] = (),
+                 fn: Optional[Callable[[], float]] = None):
+        super().__init__(name, help_text, labels)
+        self._values = {}
+        self._fn = fn
+    
+    def inc(self, amount: float = 1, **labels):
+        """Raise the gauge for a label set"""
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+    
+    def dec(self, amount: float = 1, **labels):
+        """Lower the gauge for a label set"""
+        self.inc(-amount, **labels)
+    
+    def set(self, value: float, **labels):
+        """Set the gauge for a label set"""
+        with self._lock:
+            self._values[self._key(labels)] = value
+    
+    def value(self, **labels) -> float:
+        """Current value for a label set"""
+        if self._fn is not None:
+            return self._fn()
+        return self._values.get(self._key(labels), 0)
+    
+    def render(self) -> List[str]:
+        """Render as Prometheus text lines"""
+        if self._fn is not None:
+            return self.header() + [f"{self.name} {_format_value(self._fn())}"]
+        with self._lock:
+            items = sorted(self._values.items())
+        return self.header() + [
+            f"{self.name}{_format_labels(self.label_names, key)} {_format_value(value)}"
+            for key, value in items
+        ]
+
+
+class Histogram(_Metric):
+    """Distribution of observations in cumulative buckets"""
+    
+    kind = "histogram"
+    
+    def __init__(self, name: str, help_text: str, labels: Iterable[str] = (),
+                 buckets: Iterable[float] = LATENCY_BUCKETS):
+        super().__init__(name, help_text, labels)
+        self.buckets = tuple(sorted(buckets))
+        self._series = {}
+    
+    def observe(self, value: float, **labels):
+        """Record one observation"""
+        key = self._key(labels)
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            series[0][index] += 1
+            series[1] += value
+            series[2] += 1
+    
+    @contextmanager
+    def time(self, **labels):
+        """Observe the duration of a with-block in seconds"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+    
+    def count(self, **labels) -> int:
+        """Observations recorded for a label set"""
+        series = self._series.get(self._key(labels))
+        return series[2] if series else 0
+    
+    def render(self) -> List[str]:
+        """Render as Prometheus text lines"""
+        with self._lock:
+            items = sorted((key, (list(s[0]), s[1], s[2])) for key, s in self._series.items())
+            
+        lines = self.header()
+        for key, (counts, total, count) in items:
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += bucket_count
+                le = 'le="' + _format_value(bound) + '"'
+                lines.append(f"{self.name}_bucket{_format_labels(self.label_names, key, le)} {cumulative}")
+            labels = _format_labels(self.label_names, key)
+            lines.append(f"{self.name}_sum{labels} {_format_value(total)}")
+            lines.append(f"{self.name}_count{labels} {count}")
+        return lines
+
+
+class APIMetrics:
+    """
+    Metrics collected by the API server
+    
+    Updates are a lock and a few additions, so they are cheap enough to run
+    on every request and every validation stage.
+    """
+    
+    def __init__(self, executor=None):
+        """
+        Args:
+            executor: BoundedExecutor whose load is exported (optional)
+        """
+        self.requests = Counter(
+            "c2pa_http_requests_total", "HTTP requests handled", ("method", "route", "status"))
+        self.request_latency = Histogram(
+            "c2pa_http_request_duration_seconds", "HTTP request latency", ("route",))
+        self.in_flight = Gauge(
+            "c2pa_http_requests_in_flight", "HTTP requests being handled")
+        self.stage_latency = Histogram(
+            "c2pa_validation_stage_duration_seconds",
+            "Validation stage latency (manifest_read, platform_detection, extraction, signature_validation)",
+            ("stage",))
+        self.platform_hits = Counter(
+            "c2pa_platform_detections_total", "Validated assets by detected platform",
+            ("platform", "ai_detected"))
+        self.coalesced = Counter(
+            "c2pa_coalesced_requests_total", "Requests served by joining an identical in-flight validation",
+            ("kind",))
+        self.url_cache = Counter(
+            "c2pa_url_cache_requests_total", "URL validations by result cache status (hit, miss, changed)",
+            ("status",))
+        self.payload_bytes = Histogram(
+            "c2pa_payload_bytes", "Size of validated assets", ("mime_type",), buckets=SIZE_BUCKETS)
+            
+        self._metrics = [self.requests, self.request_latency, self.in_flight,
+                         self.stage_latency, self.platform_hits, self.coalesced, self.url_cache,
+                         self.payload_bytes]
+                         
+        if executor is not None:
+            self._metrics.append(Gauge(
+                "c2pa_executor_jobs", "Validation jobs running or queued", fn=lambda: executor.in_flight))
+            self._metrics.append(Gauge(
+                "c2pa_executor_capacity", "Validation jobs accepted before 503",
+                fn=lambda: executor.max_workers + executor.max_queue))
+    
+    def stage(self, name: str):
+        """Time a validation stage: with metrics.stage("manifest_read"): ..."""
+        return self.stage_latency.time(stage=name)
+    
+    def render(self) -> str:
+        """Render all metrics in the Prometheus text format"""
+        lines = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+class MetricsMiddleware:
+    """ASGI middleware counting requests and their latency per route"""
+    
+    def __init__(self, app, metrics: APIMetrics):
+        self.app = app
+        self.metrics = metrics
+    
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+            
+        metrics = self.metrics
+        status = [500]
+        
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                status[0] = message["status"]
+            await send(message)
+            
+        metrics.in_flight.inc()
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            # Label by route template so path parameters cannot blow up cardinality
+            route = getattr(scope.get("route"), "path", None) or "unmatched"
+            metrics.in_flight.dec()
+            metrics.request_latency.observe(time.perf_counter() - start, route=route)
+            metrics.requests.inc(method=scope["method"], route=route, status=status[0])
@@ -2,7 +2,7 @@
 API Request/Response Models
 """
 
-from typing import Optional
+from typing import List, Optional
 from pydantic import BaseModel
 
 
@@ -15,3 +15,16 @@ class Base64Request(BaseModel):
 class URLRequest(BaseModel):
     """Request model for URL-based validation"""
     url: str
+
+
+class BatchItem(BaseModel):
+    """One asset in a batch: base64 data or a URL"""
+    id: Optional[str] = None
+    fileData: Optional[str] = None
+    format: Optional[str] = None
+    url: Optional[str] = None
+
+
+class BatchRequest(BaseModel):
+    """Request model for batch validation"""
+    items: List[BatchItem]
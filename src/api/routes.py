@@ -3,14 +3,341 @@ API Route Handlers
 """
 
 import os
-import base64
-from pathlib import Path
-from typing import Optional
+import re
+import json
+import time
+import asyncio
+import binascii
+from typing import AsyncIterator, List, Optional, Tuple
 
-from fastapi import FastAPI, UploadFile, File, HTTPException
-from fastapi.responses import JSONResponse
+from fastapi import FastAPI, UploadFile, File, HTTPException, Request
+from fastapi.responses import JSONResponse, PlainTextResponse, StreamingResponse
 
-from .models import Base64Request, URLRequest
+from .models import Base64Request, URLRequest, BatchItem, BatchRequest
+from .executor import ExecutorSaturated
+from .fetcher import PayloadTooLarge
+from .coalesce import content_key, normalize_url
+from ..core.locator import sniff_mime_type
+from ..core.pipeline import api_fields, api_response
+
+
+# Characters b64decode keeps in its default (non-validating) mode
+_BASE64_ALPHABET = b"ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789+/="
+_NON_BASE64 = re.compile(rb"[^A-Za-z0-9+/=]")
+
+# Base64 characters decoded per step
+_BASE64_CHUNK = 4 * 16 * 1024
+
+
+def _decode_base64(text: str) -> bytearray:
+    """
+    Decode base64 text in slices (blocking, run it on the executor)
+    
+    Matches base64.b64decode for input whose "=" padding is only at the
+    end; padding inside the text is rejected as incorrect. The multi-MB
+    string is never converted to one ASCII copy, and the output is written
+    into one buffer of the largest possible decoded size.
+    
+    Args:
+        text: Base64 text (whitespace, line breaks and other non-alphabet
+            characters are ignored)
+        
+    Returns:
+        Decoded bytes
+        
+    Raises:
+        binascii.Error: If the text is not valid base64
+    """
+    decoded = bytearray(len(text) // 4 * 3 + 3)
+    size = 0
+    carry = b""
+    
+    for start in range(0, len(text), _BASE64_CHUNK):
+        piece = text[start:start + _BASE64_CHUNK]
+        raw = piece.encode("ascii", "ignore")
+        # Only pay for the regex when the slice has something to strip
+        if len(raw) != len(piece) or raw.translate(None, _BASE64_ALPHABET):
+            raw = _NON_BASE64.sub(b"", raw)
+        raw = carry + raw
+        usable = len(raw) - len(raw) % 4
+        part = binascii.a2b_base64(raw[:usable])
+        decoded[size:size + len(part)] = part
+        size += len(part)
+        carry = raw[usable:]
+        
+    if carry:
+        part = binascii.a2b_base64(carry)
+        decoded[size:size + len(part)] = part
+        size += len(part)
+    del decoded[size:]
+    return decoded
+
+
+async def _read_body(request: Request, max_bytes: int) -> bytearray:
+    """
+    Read a raw request body with a size cap
+    
+    The body is written into one buffer, sized from Content-Length when
+    the client sends it, instead of being joined from chunks.
+    
+    Args:
+        request: Incoming request
+        max_bytes: Largest body accepted
+        
+    Returns:
+        Body bytes
+        
+    Raises:
+        PayloadTooLarge: If the body is larger than max_bytes
+    """
+    declared = request.headers.get("Content-Length")
+    declared = int(declared) if declared and declared.isdigit() else 0
+    if declared > max_bytes:
+        raise PayloadTooLarge(max_bytes)
+        
+    body = bytearray(declared)
+    size = 0
+    async for chunk in request.stream():
+        end = size + len(chunk)
+        if end > max_bytes:
+            raise PayloadTooLarge(max_bytes)
+        # Grows the buffer if the body runs past the declared length
+        body[size:end] = chunk
+        size = end
+        
+    del body[size:]
+    return body
+
+
+def _validate_content(pipeline, file_data: bytes, mime_type: Optional[str] = None,
+                      check_signature: bool = True, metrics=None,
+                      filename: Optional[str] = None) -> Optional[dict]:
+    """
+    Blocking C2PA validation of file bytes (runs on the executor)
+    
+    Args:
+        pipeline: ValidationPipeline instance
+        file_data: Raw file bytes
+        mime_type: Declared MIME type (the sniffed type wins when known)
+        check_signature: Whether to validate the signature
+        metrics: APIMetrics to record stage latencies and hits in (optional)
+        filename: Upload file name (its extension is the last resort for the type)
+        
+    Returns:
+        Platform, company, metadata, aiDetected and signatureValid,
+        or None if no platform was recognized
+    """
+    if metrics is None:
+        return api_fields(pipeline.validate(file_data, mime_type, check_signature, filename=filename))
+        
+    metrics.payload_bytes.observe(len(file_data), mime_type=sniff_mime_type(file_data) or "unknown")
+    
+    validation = pipeline.validate(file_data, mime_type, check_signature, stage=metrics.stage,
+                                   filename=filename)
+    
+    if validation is None:
+        metrics.platform_hits.inc(platform="unknown", ai_detected="unknown")
+    else:
+        metrics.platform_hits.inc(platform=validation["platform"],
+                                  ai_detected=str(bool(validation["ai_generated"])).lower())
+    return api_fields(validation)
+
+
+async def _validate_bytes(app: FastAPI, file_data: bytes, mime_type: Optional[str] = None,
+                          check_signature: bool = True, filename: Optional[str] = None) -> Optional[dict]:
+    """
+    Validate file bytes on the executor
+    
+    Identical bytes validated concurrently share one computation.
+    
+    Args:
+        app: FastAPI application instance
+        file_data: Raw file bytes
+        mime_type: Declared MIME type
+        check_signature: Whether to validate the signature
+        filename: Upload file name
+        
+    Returns:
+        Output of _validate_content (shared, do not mutate)
+    """
+    key = f"content:{int(check_signature)}:{await content_key(file_data)}"
+    
+    result, shared = await app.state.coalescer.do(key, lambda: app.state.executor.run(
+        _validate_content, app.state.pipeline, file_data, mime_type,
+        check_signature=check_signature, metrics=app.state.metrics, filename=filename
+    ))
+    if shared:
+        app.state.metrics.coalesced.inc(kind="content")
+    return result
+
+
+async def _validate_remote(app: FastAPI, url: str) -> Tuple[Optional[dict], bool, str]:
+    """
+    Fetch and validate a URL
+    
+    Concurrent requests for the same normalized URL share one download
+    and one validation. Results are cached per URL and revalidated with a
+    conditional GET, so an unchanged asset is answered from the cache.
+    
+    Args:
+        app: FastAPI application instance
+        url: Asset URL
+        
+    Returns:
+        Tuple of (output of _validate_content, partial download flag,
+        cache status: "hit", "miss" or "changed")
+    """
+    key = normalize_url(url)
+    url_cache = app.state.url_cache
+    
+    async def fetch_and_validate():
+        cached = url_cache.get(key)
+        
+        # Stream the file over pooled connections, stopping after the manifest
+        if cached is not None:
+            fetched = await app.state.url_fetcher.fetch(url, cached["etag"], cached["last_modified"])
+            if fetched.not_modified:
+                return cached["result"], cached["partial"], "hit"
+        else:
+            fetched = await app.state.url_fetcher.fetch(url)
+            
+        result = await app.state.executor.run(
+            _validate_content, app.state.pipeline, fetched.data, fetched.content_type,
+            check_signature=False, metrics=app.state.metrics
+        )
+        url_cache.set(key, result, fetched.partial, fetched.etag, fetched.last_modified)
+        return result, fetched.partial, "miss" if cached is None else "changed"
+        
+    (result, partial, cache_status), shared = await app.state.coalescer.do(f"url:{key}", fetch_and_validate)
+    if shared:
+        app.state.metrics.coalesced.inc(kind="url")
+    else:
+        url_cache.record(cache_status)
+        app.state.metrics.url_cache.inc(status=cache_status)
+    return result, partial, cache_status
+
+
+async def _validate_batch_item(app: FastAPI, index: int, item, limit: asyncio.Semaphore) -> dict:
+    """
+    Validate one batch entry, turning failures into a per-item error
+    
+    Args:
+        app: FastAPI application instance
+        index: Position of the item in the request
+        item: BatchItem or UploadFile
+        limit: Semaphore bounding the batch's concurrency
+        
+    Returns:
+        /validate/file style result with its index (and id, filename or url)
+    """
+    entry = {"index": index}
+    
+    async with limit:
+        try:
+            if isinstance(item, BatchItem):
+                if item.id is not None:
+                    entry["id"] = item.id
+                if item.url:
+                    entry["url"] = item.url
+                    result, partial, cache_status = await _validate_remote(app, item.url)
+                    entry.update(api_response(result))
+                    # URL validation skips the signature check, as in /validate/url
+                    entry.pop("signatureValid", None)
+                    entry["partial"] = partial
+                    entry["cacheStatus"] = cache_status
+                elif item.fileData:
+                    file_data = await app.state.executor.run(_decode_base64, item.fileData)
+                    result = await _validate_bytes(app, file_data, item.format)
+                    entry.update(api_response(result))
+                else:
+                    raise ValueError("Item needs fileData or url")
+            else:
+                entry["filename"] = item.filename
+                result = await _validate_bytes(app, await item.read(), item.content_type,
+                                              filename=item.filename)
+                entry.update(api_response(result))
+                
+        except HTTPException as e:
+            entry.update({"isValid": False, "error": e.detail, "status": e.status_code})
+        except Exception as e:
+            entry.update({"isValid": False, "error": str(e)})
+            
+    return entry
+
+
+def _start_batch(app: FastAPI, items: list) -> List[asyncio.Task]:
+    """
+    Schedule batch entries to run concurrently
+    
+    Args:
+        app: FastAPI application instance
+        items: BatchItem or UploadFile entries
+        
+    Returns:
+        One task per item, in request order
+    """
+    max_items = int(os.environ.get("C2PA_API_BATCH_MAX_ITEMS", 100))
+    if len(items) > max_items:
+        raise HTTPException(status_code=413, detail=f"Batch exceeds {max_items} items")
+        
+    # One executor slot per item at most, leaving the queue to other requests
+    concurrency = int(os.environ.get("C2PA_API_BATCH_CONCURRENCY", 0)) or app.state.executor.max_workers
+    limit = asyncio.Semaphore(concurrency)
+    return [
+        asyncio.ensure_future(_validate_batch_item(app, index, item, limit))
+        for index, item in enumerate(items)
+    ]
+
+
+async def _validate_batch(app: FastAPI, items: list) -> dict:
+    """
+    Validate batch entries concurrently
+    
+    Args:
+        app: FastAPI application instance
+        items: BatchItem or UploadFile entries
+        
+    Returns:
+        Count and per-item results in request order
+    """
+    results = await asyncio.gather(*_start_batch(app, items))
+    
+    return {
+        "count": len(results),
+        "results": results
+    }
+
+
+async def _stream_batch(tasks: List[asyncio.Task]) -> AsyncIterator[str]:
+    """
+    Emit batch results as NDJSON lines in completion order
+    
+    Args:
+        tasks: Tasks from _start_batch
+        
+    Yields:
+        One JSON line per item, then a {"summary": ...} line
+    """
+    started = time.monotonic()
+    summary = {"count": 0, "valid": 0, "aiDetected": 0, "errors": 0}
+    
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            entry = await next_done
+            summary["count"] += 1
+            summary["valid"] += bool(entry.get("isValid"))
+            summary["aiDetected"] += bool(entry.get("aiDetected"))
+            summary["errors"] += "error" in entry
+            yield json.dumps(entry) + "\n"
+            
+        summary["elapsed_seconds"] = round(time.monotonic() - started, 3)
+        yield json.dumps({"summary": summary}) + "\n"
+        
+    finally:
+        # Client went away: stop the items still queued
+        for task in tasks:
+            if not task.done():
+                task.cancel()
 
 
 def setup_routes(app: FastAPI):
@@ -34,8 +361,12 @@ def setup_routes(app: FastAPI):
                 "validate_file": "POST /validate/file",
                 "validate_base64": "POST /validate/base64",
                 "validate_url": "POST /validate/url",
+                "validate_raw": "POST /validate/raw",
+                "validate_batch": "POST /validate/batch",
+                "validate_batch_files": "POST /validate/batch/files",
                 "platforms": "GET /platforms",
-                "health": "GET /health"
+                "health": "GET /health",
+                "metrics": "GET /metrics"
             }
         }
     
@@ -43,12 +374,21 @@ def setup_routes(app: FastAPI):
     async def health():
         """Health check endpoint"""
         platform_registry = app.state.platform_registry
+        executor = app.state.executor
         return {
             "status": "healthy",
-            "c2pa_available": True,
-            "platforms": len(platform_registry.get_all_platforms())
+            "c2pa_available": app.state.c2pa_reader.is_available(),
+            "platforms": len(platform_registry.get_all_platforms()),
+            "in_flight": executor.in_flight,
+            "capacity": executor.max_workers + executor.max_queue
         }
     
+    @app.get("/metrics")
+    async def metrics():
+        """Prometheus metrics"""
+        return PlainTextResponse(app.state.metrics.render(),
+                                 media_type="text/plain; version=0.0.4; charset=utf-8")
+    
     @app.get("/platforms")
     async def list_platforms():
         """List all supported platforms"""
@@ -61,63 +401,17 @@ def setup_routes(app: FastAPI):
     @app.post("/validate/file")
     async def validate_file(file: UploadFile = File(...)):
         """Validate C2PA manifest from uploaded file"""
-        import c2pa
-        
-        platform_registry = app.state.platform_registry
-        temp_path = None
-        
         try:
             # Read file content
             content = await file.read()
             
-            # Save temporarily
-            temp_path = f"temp_{file.filename}"
-            with open(temp_path, 'wb') as f:
-                f.write(content)
-            
-            # Try to read C2PA manifest
-            try:
-                reader = c2pa.Reader(temp_path)
-                manifest = reader.get_active_manifest()
-            except Exception:
-                manifest = None
-            
-            # Detect platform
-            platform_name, extractor = platform_registry.detect_platform(manifest, content)
-            
-            if platform_name == "unknown":
-                return JSONResponse({
-                    "isValid": False,
-                    "message": "No C2PA manifest or platform not recognized",
-                    "aiDetected": None,
-                    "signatureValid": False
-                })
-            
-            # Extract metadata using platform extractor
-            metadata = extractor.extract_metadata(manifest, content)
+            # Validate on the executor (c2pa parse, platform detection)
+            result = await _validate_bytes(app, content, file.content_type, filename=file.filename)
             
-            # Check if AI-generated
-            is_ai = extractor.is_ai_generated(metadata)
+            return JSONResponse(api_response(result))
             
-            # Validate signature
-            signature_valid = False
-            if manifest:
-                try:
-                    validation = reader.validate()
-                    signature_valid = validation.get("valid", False)
-                except:
-                    pass
-            
-            return JSONResponse({
-                "isValid": True,
-                "platform": platform_name,
-                "company": metadata.get("company", "Unknown"),
-                "metadata": metadata,
-                "aiDetected": is_ai,
-                "signatureValid": signature_valid,
-                "message": "AI-generated content detected" if is_ai else "Human-created content"
-            })
-                
+        except ExecutorSaturated:
+            raise
         except Exception as e:
             import traceback
             error_detail = traceback.format_exc()
@@ -126,135 +420,100 @@ def setup_routes(app: FastAPI):
                 status_code=500,
                 content={"error": str(e), "detail": error_detail}
             )
-        finally:
-            # Cleanup temp file
-            if temp_path and os.path.exists(temp_path):
-                try:
-                    os.remove(temp_path)
-                except:
-                    pass
     
     @app.post("/validate/base64")
     async def validate_base64(request: Base64Request):
         """Validate C2PA manifest from base64-encoded file data"""
-        import c2pa
-        
-        platform_registry = app.state.platform_registry
-        
         try:
-            # Decode base64
-            file_data = base64.b64decode(request.fileData)
+            # Decode base64 on the executor
+            file_data = await app.state.executor.run(_decode_base64, request.fileData)
             
-            # Save temporarily
-            temp_path = "temp_base64_file"
-            with open(temp_path, 'wb') as f:
-                f.write(file_data)
+            # Validate on the executor
+            result = await _validate_bytes(app, file_data, request.format)
             
-            try:
-                # Try to read C2PA manifest
-                try:
-                    reader = c2pa.Reader(temp_path)
-                    manifest = reader.get_active_manifest()
-                except Exception:
-                    manifest = None
-                
-                # Detect platform
-                platform_name, extractor = platform_registry.detect_platform(manifest, file_data)
-                
-                if platform_name == "unknown":
-                    return JSONResponse({
-                        "isValid": False,
-                        "message": "No C2PA manifest or platform not recognized",
-                        "aiDetected": None
-                    })
-                
-                # Extract metadata
-                metadata = extractor.extract_metadata(manifest, file_data)
-                
-                # Check if AI-generated
-                is_ai = extractor.is_ai_generated(metadata)
-                
-                # Validate signature
-                signature_valid = False
-                if manifest:
-                    try:
-                        validation = reader.validate()
-                        signature_valid = validation.get("valid", False)
-                    except:
-                        pass
-                
+            if result is None:
                 return JSONResponse({
-                    "isValid": True,
-                    "platform": platform_name,
-                    "company": metadata.get("company", "Unknown"),
-                    "metadata": metadata,
-                    "aiDetected": is_ai,
-                    "signatureValid": signature_valid
+                    "isValid": False,
+                    "message": "No C2PA manifest or platform not recognized",
+                    "aiDetected": None
                 })
                 
-            finally:
-                if os.path.exists(temp_path):
-                    os.remove(temp_path)
+            return JSONResponse({
+                "isValid": True,
+                **result
+            })
+            
+        except ExecutorSaturated:
+            raise
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=str(e))
+    
+    @app.post("/validate/raw")
+    async def validate_raw(request: Request):
+        """Validate C2PA manifest from a raw application/octet-stream body"""
+        try:
+            max_bytes = int(os.environ.get("C2PA_API_MAX_UPLOAD_BYTES", 100 * 1024 * 1024))
+            file_data = await _read_body(request, max_bytes)
+            if not file_data:
+                raise HTTPException(status_code=400, detail="Empty request body")
+                
+            # Asset MIME type travels in X-Content-Type (Content-Type is octet-stream)
+            mime_type = request.headers.get("X-Content-Type")
+            if not mime_type:
+                content_type = request.headers.get("Content-Type", "").split(";")[0].strip()
+                if content_type and content_type != "application/octet-stream":
+                    mime_type = content_type
                     
+            # Validate on the executor
+            result = await _validate_bytes(app, file_data, mime_type)
+            return JSONResponse(api_response(result))
+            
+        except HTTPException:
+            raise
         except Exception as e:
             raise HTTPException(status_code=500, detail=str(e))
     
     @app.post("/validate/url")
     async def validate_url(request: URLRequest):
         """Validate C2PA manifest from URL"""
-        import c2pa
-        import requests
-        
-        platform_registry = app.state.platform_registry
-        
         try:
-            # Fetch file from URL
-            response = requests.get(request.url, timeout=30)
-            response.raise_for_status()
-            
-            file_data = response.content
+            # Fetch and validate (shared with concurrent requests for the same URL)
+            result, partial, cache_status = await _validate_remote(app, request.url)
             
-            # Save temporarily
-            temp_path = "temp_url_file"
-            with open(temp_path, 'wb') as f:
-                f.write(file_data)
-            
-            try:
-                # Try to read C2PA manifest
-                try:
-                    reader = c2pa.Reader(temp_path)
-                    manifest = reader.get_active_manifest()
-                except Exception:
-                    manifest = None
-                
-                # Detect platform
-                platform_name, extractor = platform_registry.detect_platform(manifest, file_data)
-                
-                if platform_name == "unknown":
-                    return JSONResponse({
-                        "isValid": False,
-                        "message": "No C2PA manifest or platform not recognized",
-                        "aiDetected": None
-                    })
-                
-                # Extract metadata
-                metadata = extractor.extract_metadata(manifest, file_data)
-                
-                # Check if AI-generated
-                is_ai = extractor.is_ai_generated(metadata)
-                
+            if result is None:
                 return JSONResponse({
-                    "isValid": True,
-                    "platform": platform_name,
-                    "company": metadata.get("company", "Unknown"),
-                    "metadata": metadata,
-                    "aiDetected": is_ai,
-                    "url": request.url
+                    "isValid": False,
+                    "message": "No C2PA manifest or platform not recognized",
+                    "aiDetected": None,
+                    "partial": partial,
+                    "cacheStatus": cache_status
                 })
                 
-            finally:
-                if os.path.exists(temp_path):
-                    os.remove(temp_path)
-                    
+            return JSONResponse({
+                "isValid": True,
+                **{key: value for key, value in result.items() if key != "signatureValid"},
+                "url": request.url,
+                "partial": partial,
+                "cacheStatus": cache_status
+            })
+            
+        except HTTPException:
+            raise
         except Exception as e:
             raise HTTPException(status_code=500, detail=str(e))
+    
+    @app.post("/validate/batch")
+    async def validate_batch(request: BatchRequest, stream: bool = False):
+        """Validate many base64 payloads and URLs in one call (NDJSON if stream=true)"""
+        if stream:
+            return StreamingResponse(_stream_batch(_start_batch(app, request.items)),
+                                     media_type="application/x-ndjson")
+        return JSONResponse(await _validate_batch(app, request.items))
+    
+    @app.post("/validate/batch/files")
+    async def validate_batch_files(files: List[UploadFile] = File(...), stream: bool = False):
+        """Validate many uploaded files in one call (NDJSON if stream=true)"""
+        if stream:
+            return StreamingResponse(_stream_batch(_start_batch(app, files)),
+                                     media_type="application/x-ndjson")
+        return JSONResponse(await _validate_batch(app, files))
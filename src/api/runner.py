@@ -0,0 +1,176 @@
+"""
+API Server Runner
+Serves the app from one or many worker processes sharing a listening socket
+"""
+
+import os
+import sys
+import time
+import random
+import signal
+import socket
+from typing import Optional
+
+
+def serve(app, host: str = "0.0.0.0", port: int = 8000, workers: int = 1,
+          max_requests: int = 0, max_requests_jitter: int = 0,
+          graceful_timeout: int = 30, server: str = "auto", log_level: str = "info") -> str:
+    """
+    Run the API server
+    
+    The app (platform registry, compiled marker scanner, c2pa bindings) is
+    built by the caller before any fork, so worker processes share it
+    copy-on-write instead of each building their own.
+    
+    Args:
+        app: FastAPI application (fully set up)
+        host: Interface to bind
+        port: Port to bind
+        workers: Worker processes (1 serves from this process)
+        max_requests: Recycle a worker after this many requests (0 = never)
+        max_requests_jitter: Random extra requests so workers do not recycle together
+        graceful_timeout: Seconds a stopping worker gets to finish in-flight requests
+        server: "gunicorn", "uvicorn" or "auto" (gunicorn if installed)
+        log_level: Log level for the server
+        
+    Returns:
+        Name of the server mode that ran
+    """
+    if workers > 1 and server in ("auto", "gunicorn"):
+        worker_class = _gunicorn_worker_class()
+        if worker_class:
+            _run_gunicorn(app, host, port, workers, worker_class, max_requests,
+                          max_requests_jitter, graceful_timeout, log_level)
+            return "gunicorn"
+        if server == "gunicorn":
+            print("gunicorn with a uvicorn worker class is not installed, using uvicorn workers")
+            
+    if workers > 1 and hasattr(os, "fork"):
+        _run_prefork(app, host, port, workers, max_requests, max_requests_jitter,
+                     graceful_timeout, log_level)
+        return "uvicorn-prefork"
+        
+    if workers > 1:
+        print("Multiple workers need fork(); serving from a single process")
+        
+    import uvicorn
+    uvicorn.run(app, host=host, port=port, log_level=log_level,
+                timeout_graceful_shutdown=graceful_timeout)
+    return "uvicorn"
+
+
+def _gunicorn_worker_class() -> Optional[str]:
+    """Get the uvicorn worker class for gunicorn, or None if unavailable"""
+    if sys.platform == "win32":
+        return None
+    try:
+        import gunicorn  # noqa: F401
+    except ImportError:
+        return None
+        
+    for module, worker_class in (("uvicorn_worker", "uvicorn_worker.UvicornWorker"),
+                                 ("uvicorn.workers", "uvicorn.workers.UvicornWorker")):
+        try:
+            __import__(module)
+            return worker_class
+        except ImportError:
+            continue
+    return None
+
+
+def _run_gunicorn(app, host: str, port: int, workers: int, worker_class: str,
+                  max_requests: int, max_requests_jitter: int,
+                  graceful_timeout: int, log_level: str):
+    """Serve with gunicorn, forking workers from the preloaded app"""
+    from gunicorn.app.base import BaseApplication
+    
+    class PreloadedApplication(BaseApplication):
+        def load_config(self):
+            options = {
+                "bind": f"{host}:{port}",
+                "workers": workers,
+                "worker_class": worker_class,
+                "preload_app": True,
+                "max_requests": max_requests,
+                "max_requests_jitter": max_requests_jitter,
+                "graceful_timeout": graceful_timeout,
+                "loglevel": log_level,
+            }
+            for key, value in options.items():
+                self.cfg.set(key, value)
+        
+        def load(self):
+            return app
+            
+    PreloadedApplication().run()
+
+
+def _run_prefork(app, host: str, port: int, workers: int, max_requests: int,
+                 max_requests_jitter: int, graceful_timeout: int, log_level: str):
+    """
+    Serve with forked uvicorn workers sharing one socket
+    
+    The parent only supervises: it replaces workers that exit (recycled
+    after max_requests, or crashed) and forwards SIGTERM/SIGINT so every
+    worker drains its in-flight requests before stopping.
+    """
+    import uvicorn
+    
+    sock = socket.socket(socket.AF_INET6 if ":" in host else socket.AF_INET, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(2048)
+    sock.set_inheritable(True)
+    
+    children = {}
+    stopping = False
+    
+    def spawn():
+        limit = max_requests + random.randint(0, max_requests_jitter) if max_requests else None
+        pid = os.fork()
+        if pid == 0:
+            signal.signal(signal.SIGTERM, signal.SIG_DFL)
+            signal.signal(signal.SIGINT, signal.SIG_DFL)
+            code = 0
+            try:
+                config = uvicorn.Config(app, log_level=log_level, limit_max_requests=limit,
+                                        timeout_graceful_shutdown=graceful_timeout)
+                uvicorn.Server(config).run(sockets=[sock])
+            except BaseException:
+                code = 1
+            finally:
+                os._exit(code)
+        children[pid] = time.monotonic()
+    
+    def stop(signum, frame):
+        nonlocal stopping
+        stopping = True
+        for pid in list(children):
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+                
+    signal.signal(signal.SIGTERM, stop)
+    signal.signal(signal.SIGINT, stop)
+    
+    for _ in range(workers):
+        spawn()
+        
+    try:
+        while children:
+            try:
+                pid, status = os.wait()
+            except ChildProcessError:
+                break
+            started = children.pop(pid, None)
+            if stopping or started is None:
+                continue
+                
+            # Back off if a worker dies right after starting, to avoid a fork loop
+            if os.waitstatus_to_exitcode(status) != 0 and time.monotonic() - started < 1.0:
+                time.sleep(1.0)
+            if not stopping:
+                spawn()
+    finally:
+        sock.close()
@@ -2,24 +2,67 @@
 FastAPI Server Initialization
 """
 
+from contextlib import asynccontextmanager
+from typing import Optional
+
 from fastapi import FastAPI
 from ..platforms.registry import PlatformRegistry
+from ..core.c2pa_reader import C2PAReader
+from ..core.pipeline import ValidationPipeline
+from .executor import BoundedExecutor
+from .fetcher import URLFetcher
+from .coalesce import SingleFlight
+from .url_cache import URLResultCache
+from .metrics import APIMetrics, MetricsMiddleware
 
 
-def create_app() -> FastAPI:
+def create_app(max_workers: Optional[int] = None, max_queue: Optional[int] = None) -> FastAPI:
     """
     Create and configure FastAPI application
     
+    Args:
+        max_workers: Threads for blocking validation work (env C2PA_API_WORKERS)
+        max_queue: Jobs allowed to wait before returning 503 (env C2PA_API_QUEUE)
+    
     Returns:
         Configured FastAPI app instance
     """
+    @asynccontextmanager
+    async def lifespan(app: FastAPI):
+        yield
+        await app.state.url_fetcher.close()
+        app.state.executor.shutdown(wait=False)
+    
     app = FastAPI(
         title="C2PA Verification API",
         description="Local API for C2PA manifest validation with platform detection",
-        version="2.0.0"
+        version="2.0.0",
+        lifespan=lifespan
     )
     
     # Initialize platform registry
     app.state.platform_registry = PlatformRegistry()
     
+    # Shared C2PA reader (one session per validated asset)
+    app.state.c2pa_reader = C2PAReader()
+    
+    # Validation shared with the detector's in-process Layer 1
+    app.state.pipeline = ValidationPipeline(app.state.platform_registry, app.state.c2pa_reader)
+    
+    # Blocking c2pa/extractor work runs here, off the event loop
+    app.state.executor = BoundedExecutor(max_workers, max_queue)
+    
+    # Pooled async client for /validate/url downloads
+    app.state.url_fetcher = URLFetcher()
+    
+    # /validate/url results, revalidated with conditional GETs
+    app.state.url_cache = URLResultCache()
+    
+    # Identical concurrent validations share one computation
+    app.state.coalescer = SingleFlight()
+    
+    # Request, stage and platform metrics served at /metrics
+    app.state.metrics = APIMetrics(app.state.executor)
+    app.add_middleware(MetricsMiddleware, metrics=app.state.metrics)
+    
     return app
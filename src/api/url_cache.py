@@ -0,0 +1,110 @@
+"""
+URL Result Cache
+Validation results per URL, revalidated with conditional GETs
+"""
+
+import os
+import time
+from collections import OrderedDict
+from typing import Dict, Optional
+
+
+class URLResultCache:
+    """
+    Bounded LRU of /validate/url results keyed by normalized URL
+    
+    Each entry keeps the ETag/Last-Modified of the validated asset. A repeat
+    request sends them in a conditional GET and, on a 304, is answered from
+    the entry without downloading or parsing the body. Entries without
+    validators are not stored. Used from the event loop only.
+    """
+    
+    def __init__(self, max_entries: Optional[int] = None, ttl: Optional[float] = None):
+        """
+        Args:
+            max_entries: Maximum URLs kept (env C2PA_API_URL_CACHE_SIZE, default 4096, 0 disables)
+            ttl: Seconds an entry may be revalidated before a full refetch
+                (env C2PA_API_URL_CACHE_TTL, default 3600)
+        """
+        if max_entries is None:
+            max_entries = int(os.environ.get("C2PA_API_URL_CACHE_SIZE", 4096))
+        if ttl is None:
+            ttl = float(os.environ.get("C2PA_API_URL_CACHE_TTL", 3600))
+        self.max_entries = max_entries
+        self.ttl = ttl
+        
+        self.hits = 0
+        self.misses = 0
+        self.changed = 0
+        
+        self._entries = OrderedDict()
+    
+    def get(self, key: str) -> Optional[Dict]:
+        """
+        Look up an entry to revalidate
+        
+        Args:
+            key: Normalized URL
+            
+        Returns:
+            Entry with result, partial, etag and last_modified, or None
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry["expires_at"] <= time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return entry
+    
+    def set(self, key: str, result: Optional[dict], partial: bool,
+            etag: Optional[str], last_modified: Optional[str]):
+        """
+        Store a validation result
+        
+        Args:
+            key: Normalized URL
+            result: Output of _validate_content
+            partial: Whether the download stopped after the manifest
+            etag: ETag response header
+            last_modified: Last-Modified response header
+        """
+        if self.max_entries <= 0 or self.ttl <= 0 or not (etag or last_modified):
+            self._entries.pop(key, None)
+            return
+            
+        self._entries[key] = {
+            "result": result,
+            "partial": partial,
+            "etag": etag,
+            "last_modified": last_modified,
+            "expires_at": time.monotonic() + self.ttl
+        }
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+    
+    def record(self, status: str):
+        """Count a lookup outcome ("hit", "miss" or "changed")"""
+        if status == "hit":
+            self.hits += 1
+        elif status == "changed":
+            self.changed += 1
+        else:
+            self.misses += 1
+    
+    def stats(self) -> Dict:
+        """Get hit/miss counters"""
+        lookups = self.hits + self.misses + self.changed
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "changed": self.changed,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "entries": len(self._entries)
+        }
+    
+    def clear(self):
+        """Drop all entries"""
+        self._entries.clear()
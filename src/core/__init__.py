@@ -5,5 +5,6 @@ Core modules for AI content detection
 from .detector import AIContentDetector
 from .c2pa_reader import C2PAReader
 from .api_client import APIClient
+from .cache import VerdictCache
 
-__all__ = ['AIContentDetector', 'C2PAReader', 'APIClient']
+__all__ = ['AIContentDetector', 'C2PAReader', 'APIClient', 'VerdictCache']
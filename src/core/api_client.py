@@ -3,15 +3,55 @@ API Client Module
 Handles communication with C2PA API server
 """
 
-from typing import Dict, Tuple
+import asyncio
+import threading
+from typing import Dict, Optional, Tuple, Union
 from pathlib import Path
 
 
 class APIClient:
-    """Client for C2PA API server communication"""
+    """
+    Client for C2PA API server communication
     
-    def __init__(self, endpoint: str = "http://localhost:8000"):
+    Requests go through one pooled, keep-alive HTTP session that is created
+    on first use and can be shared by the worker threads of a batch scan.
+    Asyncio callers use check_manifest_async, which sends on a pooled
+    httpx.AsyncClient without blocking the event loop; each event loop
+    gets its own client, because connections belong to the loop that
+    opened them.
+    """
+    
+    def __init__(self, endpoint: str = "http://localhost:8000", pool_size: int = 10,
+                 connect_timeout: float = 3.0, read_timeout: float = 10.0):
+        """
+        Args:
+            endpoint: API server base URL
+            pool_size: Keep-alive connections kept per host
+            connect_timeout: Seconds to wait for a connection
+            read_timeout: Seconds to wait for the response
+        """
         self.endpoint = endpoint
+        self.pool_size = pool_size
+        self.timeout = (connect_timeout, read_timeout)
+        self._session = None
+        self._async_clients = {}
+        self._lock = threading.Lock()
+    
+    def _get_session(self):
+        """Create the pooled session once, thread-safe"""
+        if self._session is None:
+            with self._lock:
+                if self._session is None:
+                    import requests
+                    from requests.adapters import HTTPAdapter
+                    
+                    session = requests.Session()
+                    adapter = HTTPAdapter(pool_connections=self.pool_size,
+                                          pool_maxsize=self.pool_size)
+                    session.mount("http://", adapter)
+                    session.mount("https://", adapter)
+                    self._session = session
+        return self._session
     
     def check_manifest(self, file_path: str) -> Tuple[str, Dict]:
         """
@@ -24,13 +64,13 @@ class APIClient:
             Tuple of (status, result_dict)
         """
         try:
-            import requests
+            session = self._get_session()
             
             url = f"{self.endpoint}/validate/file"
             
             with open(file_path, 'rb') as f:
                 files = {'file': (Path(file_path).name, f, 'application/octet-stream')}
-                response = requests.post(url, files=files, timeout=10)
+                response = session.post(url, files=files, timeout=self.timeout)
             
             if response.status_code == 200:
                 result = response.json()
@@ -46,3 +86,110 @@ class APIClient:
             if "ConnectionError" in str(type(e).__name__):
                 return "api_unavailable", {}
             return "api_error", {"error": str(e)}
+    
+    async def _get_async_client(self):
+        """
+        Get the running event loop's pooled async client, creating it on first use
+        
+        The client is closed on its own loop when that loop shuts down its
+        async generators, which asyncio.run does before closing the loop.
+        """
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            stale = [self._async_clients.pop(other) for other in list(self._async_clients)
+                     if other.is_closed()]
+            entry = self._async_clients.get(loop)
+        for _, closer in stale:
+            # The loop closed without shutting down async generators; finish
+            # the closer so it is not finalized on the dead loop
+            try:
+                closer.aclose().send(None)
+            except StopIteration:
+                pass
+        
+        if entry is None:
+            import httpx
+            
+            client = httpx.AsyncClient(
+                timeout=httpx.Timeout(self.timeout[1], connect=self.timeout[0]),
+                limits=httpx.Limits(max_connections=self.pool_size,
+                                    max_keepalive_connections=self.pool_size)
+            )
+            closer = self._close_on_shutdown(loop, client)
+            # Runs to its yield without suspending, which registers it with the loop
+            await closer.asend(None)
+            entry = (client, closer)
+            with self._lock:
+                self._async_clients[loop] = entry
+        return entry[0]
+    
+    async def _close_on_shutdown(self, loop, client):
+        """Async generator whose cleanup closes client while loop is still running"""
+        try:
+            yield
+        finally:
+            with self._lock:
+                if self._async_clients.get(loop, (None,))[0] is client:
+                    del self._async_clients[loop]
+            if not loop.is_closed():
+                await client.aclose()
+    
+    async def check_manifest_async(self, source: Union[str, bytes],
+                                   name: Optional[str] = None) -> Tuple[str, Dict]:
+        """
+        Check C2PA manifest via API server without blocking the event loop
+        
+        Args:
+            source: Path to file, or the file bytes
+            name: Upload file name (default: the path's name)
+            
+        Returns:
+            Tuple of (status, result_dict)
+        """
+        upload = None
+        try:
+            client = await self._get_async_client()
+            
+            url = f"{self.endpoint}/validate/file"
+            
+            if isinstance(source, (bytes, bytearray, memoryview)):
+                upload = bytes(source)
+            else:
+                # Stream the file; httpx reads it in chunks while sending
+                upload = await asyncio.to_thread(open, source, 'rb')
+                name = name or Path(source).name
+            files = {'file': (name or "upload", upload, 'application/octet-stream')}
+            response = await client.post(url, files=files)
+            
+            if response.status_code == 200:
+                result = response.json()
+                
+                if result.get('isValid'):
+                    return "api_success", result
+                else:
+                    return "no_manifest_api", {"message": result.get('message', 'No manifest')}
+            else:
+                return "api_error", {"status_code": response.status_code}
+                
+        except Exception as e:
+            if "ConnectError" in str(type(e).__name__):
+                return "api_unavailable", {}
+            return "api_error", {"error": str(e)}
+        finally:
+            if hasattr(upload, "close"):
+                upload.close()
+    
+    def close(self):
+        """Close pooled connections"""
+        with self._lock:
+            session, self._session = self._session, None
+        if session is not None:
+            session.close()
+    
+    async def aclose(self):
+        """Close the running event loop's async client"""
+        with self._lock:
+            entry = self._async_clients.get(asyncio.get_running_loop())
+        if entry is not None:
+            # The closer's cleanup drops the entry and closes the client
+            await entry[1].aclose()
@@ -0,0 +1,183 @@
+"""
+Batch Analysis Module
+Runs AIContentDetector over many files with a pool of worker processes
+"""
+
+import glob
+import os
+import sys
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from typing import Dict, Iterable, Iterator, List, Optional
+
+from .cache import VerdictCache
+from .detector import AIContentDetector
+
+
+IMAGE_EXTENSIONS = [".jpg", ".jpeg", ".png", ".webp"]
+VIDEO_EXTENSIONS = [".mp4", ".mov", ".avi", ".webm", ".mkv", ".flv", ".wmv"]
+MEDIA_EXTENSIONS = IMAGE_EXTENSIONS + VIDEO_EXTENSIONS
+
+# Detector owned by the current worker process
+_worker_detector = None
+
+
+def iter_paths(inputs: Iterable[str], list_file: Optional[str] = None) -> Iterator[str]:
+    """
+    Expand directories, globs and file lists into file paths
+    
+    Args:
+        inputs: Files, directories (scanned recursively for media files) or glob patterns
+        list_file: File with one path per line ("-" for stdin)
+        
+    Yields:
+        File paths
+    """
+    for item in inputs:
+        if os.path.isdir(item):
+            for root, dirs, files in os.walk(item):
+                dirs.sort()
+                for name in sorted(files):
+                    if os.path.splitext(name)[1].lower() in MEDIA_EXTENSIONS:
+                        yield os.path.join(root, name)
+        elif glob.has_magic(item):
+            for path in sorted(glob.iglob(item, recursive=True)):
+                if os.path.isfile(path):
+                    yield path
+        else:
+            yield item
+            
+    if list_file:
+        stream = sys.stdin if list_file == "-" else open(list_file, encoding="utf-8")
+        try:
+            for line in stream:
+                path = line.strip()
+                if path:
+                    yield path
+        finally:
+            if stream is not sys.stdin:
+                stream.close()
+
+
+def _build_detector(api_endpoint: Optional[str], cache_path: Optional[str],
+                    timings: bool = False) -> AIContentDetector:
+    """Create a detector, with a persistent verdict cache if requested"""
+    cache = VerdictCache(db_path=cache_path) if cache_path else None
+    return AIContentDetector(api_endpoint, cache=cache, timings=timings)
+
+
+def _init_worker(api_endpoint: Optional[str], cache_path: Optional[str], timings: bool = False):
+    """Build the detector once per worker process"""
+    global _worker_detector
+    _worker_detector = _build_detector(api_endpoint, cache_path, timings)
+
+
+def _analyze_in_worker(file_paths: List[str], batch_size: int) -> List[Dict]:
+    """Analyze a chunk of files with the worker's detector"""
+    return _analyze_safely(_worker_detector, file_paths, batch_size)
+
+
+def _analyze_safely(detector: AIContentDetector, file_paths: List[str], batch_size: int) -> List[Dict]:
+    """Analyze a chunk of files, turning unexpected failures into error results"""
+    try:
+        return detector.analyze_files(file_paths, batch_size=batch_size)
+    except Exception as e:
+        return [{"file": file_path, "exists": os.path.exists(file_path),
+                 "final_verdict": "error", "confidence": None, "error": str(e)}
+                for file_path in file_paths]
+
+
+def _chunks(paths: Iterable[str], size: int) -> Iterator[List[str]]:
+    """Group paths into lists of up to size items"""
+    chunk = []
+    for path in paths:
+        chunk.append(path)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def analyze_paths(paths: Iterable[str], jobs: Optional[int] = None,
+                  api_endpoint: Optional[str] = None,
+                  cache_path: Optional[str] = None,
+                  batch_size: int = 8, timings: bool = False) -> Iterator[Dict]:
+    """
+    Analyze many files, yielding results as they finish
+    
+    Files are handed to workers in chunks of batch_size so that the
+    Layer-3 fallbacks of each chunk run as one batched model call.
+    
+    Args:
+        paths: File paths (consumed lazily, so millions of paths are fine)
+        jobs: Worker processes (defaults to CPU count, 1 runs in-process)
+        api_endpoint: C2PA API server URL
+        cache_path: SQLite file for a verdict cache shared by all workers
+        batch_size: Files per worker task and images per model forward pass
+        timings: Add per-stage durations to each result
+        
+    Yields:
+        Analysis result per file, in completion order
+    """
+    jobs = jobs or os.cpu_count() or 1
+    chunks = _chunks(paths, max(1, batch_size))
+    
+    if jobs == 1:
+        detector = _build_detector(api_endpoint, cache_path, timings)
+        for chunk in chunks:
+            yield from _analyze_safely(detector, chunk, batch_size)
+        return
+        
+    # Keep a bounded number of chunks in flight instead of submitting them all
+    window = jobs * 2
+    
+    with ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker,
+                             initargs=(api_endpoint, cache_path, timings)) as pool:
+        pending = set()
+        exhausted = False
+        
+        while pending or not exhausted:
+            while not exhausted and len(pending) < window:
+                chunk = next(chunks, None)
+                if chunk is None:
+                    exhausted = True
+                else:
+                    pending.add(pool.submit(_analyze_in_worker, chunk, batch_size))
+                    
+            if not pending:
+                break
+                
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield from future.result()
+
+
+class BatchStats:
+    """Running counters for an end-of-run throughput summary"""
+    
+    def __init__(self):
+        self.files = 0
+        self.verdicts = {}
+    
+    def add(self, result: Dict):
+        """Count one finished result"""
+        verdict = result.get("final_verdict") or "unknown"
+        self.files += 1
+        self.verdicts[verdict] = self.verdicts.get(verdict, 0) + 1
+    
+    def summary(self, elapsed: float) -> Dict:
+        """
+        Build the summary
+        
+        Args:
+            elapsed: Wall-clock seconds for the run
+            
+        Returns:
+            File count, throughput and verdict counts
+        """
+        return {
+            "files": self.files,
+            "elapsed_seconds": round(elapsed, 3),
+            "files_per_second": round(self.files / elapsed, 2) if elapsed > 0 else 0.0,
+            "verdicts": dict(sorted(self.verdicts.items()))
+        }
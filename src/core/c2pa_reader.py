@@ -3,7 +3,179 @@ C2PA Reader Module
 Handles C2PA manifest reading and validation
 """
 
-from typing import Dict, Optional, Tuple
+import io
+import os
+import json
+import tempfile
+import mimetypes
+from typing import Dict, Optional, Tuple, Union
+
+from .locator import sniff_mime_type
+
+
+_UNSET = object()
+
+
+class _BufferStream(io.RawIOBase):
+    """Read-only seekable stream over a bytes-like object, without copying it"""
+    
+    def __init__(self, data):
+        self._view = memoryview(data).cast("B")
+        self._pos = 0
+    
+    def readable(self) -> bool:
+        return True
+    
+    def seekable(self) -> bool:
+        return True
+    
+    def readinto(self, buffer) -> int:
+        chunk = self._view[self._pos:self._pos + len(buffer)]
+        size = len(chunk)
+        memoryview(buffer).cast("B")[:size] = chunk
+        self._pos += size
+        return size
+    
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        if whence == io.SEEK_CUR:
+            offset += self._pos
+        elif whence == io.SEEK_END:
+            offset += len(self._view)
+        if offset < 0:
+            raise ValueError("negative seek position")
+        self._pos = offset
+        return offset
+    
+    def tell(self) -> int:
+        return self._pos
+    
+    def close(self):
+        self._view.release()
+        super().close()
+
+
+class C2PASession:
+    """
+    One parsed C2PA asset
+    
+    The asset is opened, parsed and hashed once by a single c2pa.Reader;
+    the active manifest, the full manifest store and the validation status
+    are all served from that parse and cached.
+    """
+    
+    def __init__(self, c2pa_module, source: Union[str, bytes], mime_type: Optional[str] = None):
+        """
+        Args:
+            c2pa_module: Imported c2pa library (None for an empty session)
+            source: Path to file, or the file bytes
+            mime_type: MIME type of in-memory data (sniffed from the header if None)
+        """
+        self.file_path = source if isinstance(source, (str, os.PathLike)) else None
+        self.mime_type = mime_type
+        self.reader = None
+        self.error = None
+        self._temp_path = None
+        self._manifest = _UNSET
+        self._manifest_store = _UNSET
+        self._validation = _UNSET
+        
+        if c2pa_module is None:
+            return
+            
+        try:
+            if self.file_path is not None:
+                self.reader = c2pa_module.Reader(self.file_path)
+            else:
+                self.reader = self._open_stream(c2pa_module, source)
+        except Exception as e:
+            self.error = e
+    
+    def _open_stream(self, c2pa_module, data: bytes):
+        """Read from memory, spooling to a unique temp file only if the library needs a path"""
+        if self.mime_type is None or self.mime_type == "application/octet-stream":
+            self.mime_type = sniff_mime_type(data) or self.mime_type
+            
+        # BytesIO shares bytes but would copy a bytearray (decoded uploads)
+        stream = io.BytesIO(data) if isinstance(data, bytes) else _BufferStream(data)
+        try:
+            return c2pa_module.Reader(self.mime_type, stream)
+        except (TypeError, AttributeError, NotImplementedError):
+            # Older c2pa releases only read from paths
+            suffix = mimetypes.guess_extension(self.mime_type or "") or ""
+            fd, self._temp_path = tempfile.mkstemp(prefix="c2pa_", suffix=suffix)
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+            return c2pa_module.Reader(self._temp_path)
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+    
+    @property
+    def manifest(self) -> Optional[Dict]:
+        """Active manifest, or None if not found"""
+        if self._manifest is _UNSET:
+            self._manifest = None
+            if self.reader is not None:
+                try:
+                    self._manifest = self.reader.get_active_manifest()
+                except Exception:
+                    pass
+        return self._manifest
+    
+    @property
+    def manifest_store(self) -> Optional[Dict]:
+        """Full manifest store, or None if not found"""
+        if self._manifest_store is _UNSET:
+            self._manifest_store = None
+            if self.reader is not None:
+                try:
+                    self._manifest_store = json.loads(self.reader.json())
+                except Exception:
+                    pass
+        return self._manifest_store
+    
+    @property
+    def validation(self) -> Optional[Dict]:
+        """Validation status, or None if it could not be determined"""
+        if self._validation is _UNSET:
+            self._validation = None
+            if self.reader is not None:
+                try:
+                    self._validation = self.reader.validate()
+                except Exception:
+                    pass
+        return self._validation
+    
+    def validate_signature(self) -> Tuple[bool, Optional[Dict]]:
+        """
+        Validate C2PA signature
+        
+        Returns:
+            Tuple of (is_valid, validation_info)
+        """
+        validation = self.validation
+        if validation is None:
+            return False, None
+        return validation.get("valid", False), validation
+    
+    def close(self):
+        """Release the underlying reader"""
+        reader, self.reader = self.reader, None
+        if reader is not None and hasattr(reader, "close"):
+            try:
+                reader.close()
+            except Exception:
+                pass
+                
+        if self._temp_path is not None:
+            try:
+                os.remove(self._temp_path)
+            except OSError:
+                pass
+            self._temp_path = None
 
 
 class C2PAReader:
@@ -27,6 +199,19 @@ class C2PAReader:
         """Check if C2PA library is available"""
         return self.c2pa_available
     
+    def open_session(self, source: Union[str, bytes], mime_type: Optional[str] = None) -> C2PASession:
+        """
+        Open an asset once for manifest reading and validation
+        
+        Args:
+            source: Path to file, or the file bytes
+            mime_type: MIME type of in-memory data (sniffed if None)
+            
+        Returns:
+            C2PASession (empty if the C2PA library is not available)
+        """
+        return C2PASession(self.c2pa if self.c2pa_available else None, source, mime_type)
+    
     def read_manifest(self, file_path: str) -> Optional[Dict]:
         """
         Read C2PA manifest from file
@@ -39,13 +224,9 @@ class C2PAReader:
         """
         if not self.c2pa_available:
             return None
-        
-        try:
-            reader = self.c2pa.Reader(file_path)
-            manifest = reader.get_active_manifest()
-            return manifest
-        except Exception:
-            return None
+            
+        with self.open_session(file_path) as session:
+            return session.manifest
     
     def validate_signature(self, file_path: str) -> Tuple[bool, Optional[Dict]]:
         """
@@ -59,11 +240,6 @@ class C2PAReader:
         """
         if not self.c2pa_available:
             return False, None
-        
-        try:
-            reader = self.c2pa.Reader(file_path)
-            validation = reader.validate()
-            is_valid = validation.get("valid", False)
-            return is_valid, validation
-        except Exception:
-            return False, None
+            
+        with self.open_session(file_path) as session:
+            return session.validate_signature()
@@ -0,0 +1,205 @@
+"""
+Verdict Cache Module
+Content-hash keyed cache for analysis results
+"""
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Optional
+
+
+# Seconds to keep each verdict type. Signed C2PA verdicts do not change for
+# the same bytes; model and API-dependent verdicts are kept shorter.
+DEFAULT_TTLS = {
+    "AI_DETECTED_C2PA_API": 7 * 86400,
+    "HUMAN_VERIFIED_C2PA_API": 7 * 86400,
+    "AI_DETECTED_C2PA": 7 * 86400,
+    "HUMAN_VERIFIED": 7 * 86400,
+    "NO_C2PA_FOUND": 86400,
+    "AI_LIKELY": 86400,
+    "HUMAN_LIKELY": 86400,
+    "UNCERTAIN": 3600,
+    "UNSUPPORTED_FORMAT": 86400,
+}
+
+# Layer-3 outcomes that say nothing about the content (model missing or failed)
+TRANSIENT_DETECTION_STATUSES = {"error", "unavailable"}
+
+
+def hash_file(file_path: str, chunk_size: int = 1024 * 1024) -> str:
+    """
+    Compute the SHA-256 of a file without loading it into memory
+    
+    Args:
+        file_path: Path to file
+        chunk_size: Bytes read per step
+        
+    Returns:
+        Hex digest
+    """
+    digest = hashlib.sha256()
+    buffer = bytearray(chunk_size)
+    view = memoryview(buffer)
+    
+    with open(file_path, 'rb') as f:
+        while True:
+            size = f.readinto(buffer)
+            if not size:
+                break
+            digest.update(view[:size])
+            
+    return digest.hexdigest()
+
+
+class VerdictCache:
+    """
+    Two-tier cache of analysis results keyed by content hash
+    
+    A bounded in-memory LRU sits in front of an optional SQLite store, so
+    repeat files are answered without the API round-trip, the C2PA parse
+    or model inference. Safe to share between threads.
+    """
+    
+    def __init__(self, max_entries: int = 1024, db_path: Optional[str] = None,
+                 ttls: Optional[Dict[str, float]] = None, default_ttl: float = 3600):
+        """
+        Args:
+            max_entries: Maximum results kept in memory
+            db_path: SQLite file for the persistent tier (memory only if None)
+            ttls: Seconds to keep each final verdict (0 disables caching it)
+            default_ttl: Seconds to keep verdicts not listed in ttls
+        """
+        self.max_entries = max_entries
+        self.ttls = dict(DEFAULT_TTLS)
+        if ttls:
+            self.ttls.update(ttls)
+        self.default_ttl = default_ttl
+        
+        self.hits = 0
+        self.misses = 0
+        self.disk_hits = 0
+        
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._db = None
+        
+        if db_path:
+            # Batch workers share the file: WAL lets readers run during a write,
+            # and the timeout makes writers wait for the lock instead of failing
+            self._db = sqlite3.connect(db_path, timeout=30, check_same_thread=False)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS verdicts ("
+                "key TEXT PRIMARY KEY, expires_at REAL NOT NULL, result TEXT NOT NULL)"
+            )
+            self._db.commit()
+    
+    def ttl_for(self, result: Dict) -> float:
+        """Get the TTL in seconds for a result's verdict (0 if it must not be cached)"""
+        if (result.get("detection_status") in TRANSIENT_DETECTION_STATUSES
+                or result.get("api_status") == "api_error"
+                or result.get("c2pa_status") == "error"):
+            # A retry may succeed once the model loads or the failure clears
+            return 0
+        return self.ttls.get(result.get("final_verdict"), self.default_ttl)
+    
+    def get(self, key: str) -> Optional[Dict]:
+        """
+        Look up a cached result
+        
+        Args:
+            key: Content hash
+            
+        Returns:
+            Copy of the cached result, or None on a miss
+        """
+        now = time.time()
+        
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires_at, payload = entry
+                if expires_at > now:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return json.loads(payload)
+                del self._entries[key]
+                
+            if self._db is not None:
+                row = self._db.execute(
+                    "SELECT expires_at, result FROM verdicts WHERE key = ?", (key,)
+                ).fetchone()
+                if row is not None:
+                    expires_at, payload = row
+                    if expires_at > now:
+                        self._remember(key, expires_at, payload)
+                        self.hits += 1
+                        self.disk_hits += 1
+                        return json.loads(payload)
+                    self._db.execute("DELETE FROM verdicts WHERE key = ?", (key,))
+                    self._db.commit()
+                    
+            self.misses += 1
+            return None
+    
+    def set(self, key: str, result: Dict):
+        """
+        Store a result
+        
+        Args:
+            key: Content hash
+            result: Analysis result
+        """
+        ttl = self.ttl_for(result)
+        if ttl <= 0:
+            return
+            
+        expires_at = time.time() + ttl
+        payload = json.dumps(result, default=str)
+        
+        with self._lock:
+            self._remember(key, expires_at, payload)
+            if self._db is not None:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO verdicts (key, expires_at, result) VALUES (?, ?, ?)",
+                    (key, expires_at, payload)
+                )
+                self._db.commit()
+    
+    def _remember(self, key: str, expires_at: float, payload: str):
+        """Insert into the in-memory LRU, evicting the oldest entries"""
+        self._entries[key] = (expires_at, payload)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+    
+    def stats(self) -> Dict:
+        """Get hit/miss counters"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "disk_hits": self.disk_hits,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "memory_entries": len(self._entries)
+            }
+    
+    def clear(self):
+        """Drop all cached results"""
+        with self._lock:
+            self._entries.clear()
+            if self._db is not None:
+                self._db.execute("DELETE FROM verdicts")
+                self._db.commit()
+    
+    def close(self):
+        """Close the persistent store"""
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
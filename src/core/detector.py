@@ -4,85 +4,337 @@ Orchestrates 3-layer AI detection system
 """
 
 import os
+import time
+import asyncio
+import hashlib
+import functools
+from concurrent.futures import Executor
 from pathlib import Path
-from typing import Dict, Optional
+from typing import AsyncIterable, AsyncIterator, Dict, Iterable, List, Optional, Union
+from urllib.parse import urlsplit
 
 from .c2pa_reader import C2PAReader
 from .api_client import APIClient
+from .locator import probe_manifest, sniff_mime_type
+from .pipeline import ValidationPipeline, api_fields, api_response
+from .cache import VerdictCache, hash_file
+from .tracing import Trace, Tracer, get_tracer
 from ..platforms.registry import PlatformRegistry
 from ..models.image_detector import ImageDetector
 
 
+# Endpoints served by this machine; Layer 1 validates them in-process
+_LOCAL_HOSTS = {"localhost", "127.0.0.1", "::1", "0.0.0.0"}
+
+# Endpoint values that turn the API server off
+_DISABLED_ENDPOINTS = {"", "none", "off", "local"}
+
+# Stand-in for analyses that are neither timed nor traced
+_NO_TRACE = Trace("analyze_file")
+
+# Format fallback for in-memory files, which have no extension
+_SNIFFED_EXTENSIONS = {
+    "image/png": ".png",
+    "image/jpeg": ".jpg",
+    "image/webp": ".webp",
+    "video/mp4": ".mp4",
+    "video/quicktime": ".mov"
+}
+
+
+def is_local_endpoint(endpoint: Optional[str]) -> bool:
+    """
+    Check whether an API endpoint is on this machine or disabled
+    
+    Args:
+        endpoint: API server base URL
+        
+    Returns:
+        True if Layer 1 can run in-process instead of over HTTP
+    """
+    if endpoint is None or endpoint.strip().lower() in _DISABLED_ENDPOINTS:
+        return True
+    try:
+        host = urlsplit(endpoint).hostname
+    except ValueError:
+        return False
+    return (host or "").lower() in _LOCAL_HOSTS
+
+
 class AIContentDetector:
     """Multi-layered AI content detection using C2PA and image detection"""
     
-    def __init__(self, api_endpoint: Optional[str] = None):
+    def __init__(self, api_endpoint: Optional[str] = None, cache: Optional[VerdictCache] = None,
+                 prewarm_model: bool = False, prefilter: bool = True,
+                 in_process: Optional[bool] = None, timings: bool = False,
+                 tracer: Optional[Tracer] = None):
+        """
+        Args:
+            api_endpoint: C2PA API server URL (default http://localhost:8000;
+                "none" disables the server)
+            cache: Verdict cache (optional)
+            prewarm_model: Load the Layer-3 model in the background now
+            prefilter: Skip files whose container headers carry no manifest
+            in_process: Run Layer 1 in this process instead of over HTTP
+                (default: when the endpoint is local or disabled)
+            timings: Add per-stage durations (seconds) to results as "timings"
+            tracer: Receives a span per stage (default: tracing.set_tracer's)
+        """
+        self.cache = cache
+        self.prefilter = prefilter
+        self.timings = timings
+        self.tracer = tracer
+        self.in_process = is_local_endpoint(api_endpoint) if in_process is None else in_process
         self.api_client = APIClient(api_endpoint or "http://localhost:8000")
         self.c2pa_reader = C2PAReader()
         self.platform_registry = PlatformRegistry()
-        self.image_detector = ImageDetector()
+        # Same validation the API server runs, shared by Layers 1 and 2
+        self.pipeline = ValidationPipeline(self.platform_registry, self.c2pa_reader)
+        # Layer 3 model loads on first use unless prewarmed in the background
+        self.image_detector = ImageDetector(prewarm=prewarm_model)
     
     def check_c2pa_api(self, file_path: str) -> tuple:
         """Check C2PA via API server (Layer 1 - Priority)"""
         return self.api_client.check_manifest(file_path)
     
-    def check_c2pa_embedded(self, file_path: str) -> tuple:
+    def check_c2pa_embedded(self, file_path: str, stage=None) -> tuple:
         """Check embedded C2PA with platform detection (Layer 2)"""
         if not self.c2pa_reader.is_available():
             return "unavailable", {}
         
         try:
-            # Read file for platform detection
-            with open(file_path, 'rb') as f:
-                raw_data = f.read()
-            
-            # Try to read C2PA manifest
-            manifest = self.c2pa_reader.read_manifest(file_path)
-            
-            # Detect platform using modular system
-            platform_name, extractor = self.platform_registry.detect_platform(manifest, raw_data)
+            return self._embedded_result(self.pipeline.validate(file_path, stage=stage))
+        except Exception as e:
+            return "error", {"error": str(e)}
+    
+    def _embedded_result(self, validation: Optional[Dict]) -> tuple:
+        """Layer-2 status for a pipeline result"""
+        if not self.c2pa_reader.is_available():
+            return "unavailable", {}
+        
+        if validation is None:
+            return "no_platform_detected", {}
+        
+        if validation["ai_generated"]:
+            if validation["signature_valid"]:
+                return "ai_confirmed", validation
+            else:
+                return "ai_confirmed_unsigned", validation
+        else:
+            if validation["signature_valid"]:
+                return "human_verified", validation
+            else:
+                return "signature_invalid", validation
+    
+    def analyze_file(self, file_path: str) -> Dict:
+        """Main analysis function - 3-layer detection"""
+        return self.analyze_files([file_path])[0]
+    
+    def analyze_files(self, file_paths: List[str], batch_size: int = 8) -> List[Dict]:
+        """
+        Analyze several files, batching their Layer-3 fallbacks
+        
+        Layers 1 and 2 run per file; every image that still needs the AI
+        model is then classified together through ImageDetector.detect_batch.
+        A file that fails with an unexpected error gets an error result
+        without affecting the others.
+        
+        Args:
+            file_paths: Paths to files
+            batch_size: Images per model forward pass
             
-            if platform_name == "unknown":
-                return "no_platform_detected", {}
+        Returns:
+            List of analysis results, in input order
+        """
+        results = []
+        pending = []  # (result, content_hash, trace) awaiting Layer 3
+        
+        for file_path in file_paths:
+            trace = self._trace(file_path)
+            try:
+                result, content_hash = self._start(file_path, trace=trace)
+                settled = result["final_verdict"] is not None  # missing or cached
+                if not settled:
+                    self._analyze_layers(file_path, result, trace=trace)
+            except Exception as e:
+                result, settled = self._error_result(file_path, e), True
+            results.append(result)
             
-            # Extract metadata using platform-specific extractor
-            metadata = extractor.extract_metadata(manifest, raw_data)
+            if settled:
+                trace.finish(result)
+            elif result["final_verdict"] is None:
+                pending.append((result, content_hash, trace))
+            else:
+                self._finish(result, content_hash, trace)
+        
+        # LAYER 3: Fallback AI detection, batched across files
+        if pending:
+            started = time.perf_counter()
+            detections = self.image_detector.detect_batch(
+                [result["file"] for result, _, _ in pending], batch_size=batch_size
+            )
+            ended = time.perf_counter()
+            for (result, content_hash, trace), (detection_status, score) in zip(pending, detections):
+                # Each file reports the batched call it waited for
+                trace.add_stage("inference", started, ended, batch_size=len(pending))
+                self._apply_detection(result, detection_status, score)
+                self._finish(result, content_hash, trace)
+        
+        return results
+    
+    async def analyze_file_async(self, source: Union[str, bytes], name: Optional[str] = None,
+                                 executor: Optional[Executor] = None) -> Dict:
+        """
+        3-layer detection without blocking the event loop
+        
+        Layer 1 goes over the async HTTP client (or runs in-process on the
+        executor); c2pa parsing, hashing, cache access and the Layer-3 model
+        all run on the executor, so the loop only waits.
+        
+        Args:
+            source: Path to file, or the file bytes
+            name: Label reported as "file" for bytes (default "<bytes>")
+            executor: Thread pool for blocking work (default: the loop's)
             
-            # Check if AI-generated
-            is_ai = extractor.is_ai_generated(metadata)
+        Returns:
+            Analysis result
+        """
+        loop = asyncio.get_running_loop()
+        in_memory = isinstance(source, (bytes, bytearray, memoryview))
+        trace = self._trace((name or "<bytes>") if in_memory else source)
+        
+        result, content_hash = await loop.run_in_executor(
+            executor, functools.partial(self._start, source, name, trace=trace))
+        if result["final_verdict"] is not None:
+            return trace.finish(result)
+        
+        if self.in_process:
+            await loop.run_in_executor(
+                executor, functools.partial(self._analyze_layers, source, result, trace=trace))
+        else:
+            settled = await loop.run_in_executor(executor, self._apply_prefilter, source, result, trace)
+            if settled:
+                self._apply_format_fallback(source, result)
+            else:
+                # LAYER 1 over non-blocking HTTP; the rest continues on the executor
+                with trace.stage("api", mode="http"):
+                    api_status, api_info = await self.api_client.check_manifest_async(source, name)
+                await loop.run_in_executor(executor, functools.partial(
+                    self._analyze_layers, source, result, api_result=(api_status, api_info, None),
+                    trace=trace))
+        
+        # LAYER 3: Fallback AI detection
+        if result["final_verdict"] is None:
+            with trace.stage("inference", batch_size=1):
+                detection_status, score = await loop.run_in_executor(
+                    executor, self.image_detector.detect, source)
+            self._apply_detection(result, detection_status, score)
+        
+        if self.cache is not None and content_hash is not None:
+            with trace.stage("cache_store"):
+                await loop.run_in_executor(executor, self.cache.set, content_hash, result)
+        
+        return trace.finish(result)
+    
+    async def analyze_many_async(self, sources: Union[AsyncIterable, Iterable], concurrency: int = 100,
+                                 executor: Optional[Executor] = None) -> AsyncIterator[Dict]:
+        """
+        Analyze many files concurrently, yielding results as they finish
+        
+        At most concurrency analyses are in flight; sources are pulled
+        lazily as slots free up. Blocking work shares the executor's
+        threads, so thousands of analyses in flight do not mean thousands
+        of threads.
+        
+        Args:
+            sources: Async or plain iterable of paths or file bytes
+            concurrency: Maximum analyses in flight
+            executor: Thread pool for blocking work (default: the loop's)
             
-            # Validate signature if manifest available
-            signature_valid = False
-            if manifest:
-                signature_valid, _ = self.c2pa_reader.validate_signature(file_path)
+        Yields:
+            Analysis result per source, in completion order
+        """
+        if hasattr(sources, "__aiter__"):
+            iterator = sources.__aiter__()
             
-            result = {
-                "platform": platform_name,
-                "company": metadata.get("company", "Unknown"),
-                "metadata": metadata,
-                "ai_generated": is_ai,
-                "signature_valid": signature_valid
-            }
+            async def next_source():
+                return await iterator.__anext__()
+        else:
+            iterator = iter(sources)
             
-            if is_ai:
-                if signature_valid:
-                    return "ai_confirmed", result
-                else:
-                    return "ai_confirmed_unsigned", result
-            else:
-                if signature_valid:
-                    return "human_verified", result
-                else:
-                    return "signature_invalid", result
-                    
+            async def next_source():
+                try:
+                    return next(iterator)
+                except StopIteration:
+                    raise StopAsyncIteration
+        
+        pending = set()
+        exhausted = False
+        try:
+            while pending or not exhausted:
+                while not exhausted and len(pending) < max(1, concurrency):
+                    try:
+                        source = await next_source()
+                    except StopAsyncIteration:
+                        exhausted = True
+                    else:
+                        pending.add(asyncio.ensure_future(self._analyze_safely_async(source, executor)))
+                
+                if not pending:
+                    break
+                
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    yield task.result()
+        finally:
+            # The caller stopped iterating early; drop unfinished analyses
+            for task in pending:
+                task.cancel()
+    
+    async def _analyze_safely_async(self, source: Union[str, bytes], executor: Optional[Executor]) -> Dict:
+        """Analyze one source, turning unexpected failures into an error result"""
+        try:
+            return await self.analyze_file_async(source, executor=executor)
         except Exception as e:
-            return "error", {"error": str(e)}
+            return self._error_result(source, e)
     
-    def analyze_file(self, file_path: str) -> Dict:
-        """Main analysis function - 3-layer detection"""
+    def _error_result(self, source: Union[str, bytes], error: Exception) -> Dict:
+        """Result for a source whose analysis failed unexpectedly"""
+        in_memory = isinstance(source, (bytes, bytearray, memoryview))
+        return {"file": "<bytes>" if in_memory else source, "exists": in_memory or os.path.exists(source),
+                "final_verdict": "error", "confidence": None, "error": str(error)}
+    
+    async def aclose(self):
+        """Close the async API client"""
+        await self.api_client.aclose()
+    
+    def _finish(self, result: Dict, content_hash: Optional[str], trace: Trace) -> Dict:
+        """Cache a computed result and close its trace"""
+        if self.cache is not None and content_hash is not None:
+            with trace.stage("cache_store"):
+                self.cache.set(content_hash, result)
+        return trace.finish(result)
+    
+    def _trace(self, label: str) -> Trace:
+        """Start the trace of one analysis (a shared no-op unless timing or tracing)"""
+        tracer = self.tracer or get_tracer()
+        if not self.timings and tracer is None:
+            return _NO_TRACE
+        return Trace("analyze_file", tracer, self.timings, {"file": label})
+    
+    def _start(self, source: Union[str, bytes], name: Optional[str] = None,
+               trace: Trace = _NO_TRACE) -> tuple:
+        """
+        Create the result for a source and answer it from the cache if possible
+        
+        Returns:
+            Tuple of (result, content_hash); the result already has a
+            final_verdict if the file is missing or was cached
+        """
+        in_memory = isinstance(source, (bytes, bytearray, memoryview))
         result = {
-            "file": file_path,
-            "exists": os.path.exists(file_path),
+            "file": (name or "<bytes>") if in_memory else source,
+            "exists": in_memory or os.path.exists(source),
             "api_status": None,
             "api_info": {},
             "c2pa_status": None,
@@ -90,19 +342,101 @@ class AIContentDetector:
             "detection_status": None,
             "detection_score": 0.0,
             "final_verdict": None,
-            "confidence": None
+            "confidence": None,
+            "prefilter": None
         }
         
         if not result["exists"]:
             result["final_verdict"] = "file_not_found"
-            return result
+            return result, None
+        
+        # Repeat content is answered from the verdict cache
+        content_hash = None
+        if self.cache is not None:
+            with trace.stage("cache_lookup"):
+                try:
+                    content_hash = hashlib.sha256(source).hexdigest() if in_memory else hash_file(source)
+                except OSError:
+                    # Unreadable (e.g. a directory): analyze it uncached
+                    return result, None
+                cached = self.cache.get(content_hash)
+            if cached is not None:
+                cached["file"] = result["file"]
+                return cached, content_hash
+        
+        return result, content_hash
+    
+    def _apply_prefilter(self, source: Union[str, bytes], result: Dict,
+                         trace: Trace = _NO_TRACE) -> bool:
+        """
+        PREFILTER: no manifest box in the container headers means no C2PA
+        
+        Returns:
+            True if the file has no manifest and only the format fallback is left
+        """
+        if not self.prefilter:
+            return False
         
-        # LAYER 1: Check C2PA API
-        api_status, api_info = self.check_c2pa_api(file_path)
+        with trace.stage("prefilter"):
+            try:
+                presence = probe_manifest(source)
+            except (OSError, ValueError):
+                # Unreadable (a directory, no permission, deleted meanwhile):
+                # leave it to the layers, as without the prefilter
+                presence = None
+        if presence is False:
+            result["prefilter"] = "no_manifest"
+            result["api_status"] = "skipped"
+            result["c2pa_status"] = "no_manifest"
+            return True
+        result["prefilter"] = "manifest_found" if presence else "unknown_container"
+        return False
+    
+    def _check_in_process(self, source: Union[str, bytes], stage=None) -> tuple:
+        """Layer 1 through the shared pipeline: (api_status, api_info, validation)"""
+        try:
+            validation = self.pipeline.validate(source, stage=stage)
+        except Exception as e:
+            return "api_error", {"error": str(e)}, None
+        
+        api_info = api_response(api_fields(validation))
+        if validation is None:
+            return "no_manifest_api", {"message": api_info["message"]}, None
+        return "api_success", api_info, validation
+    
+    def _analyze_layers(self, file_path: Union[str, bytes], result: Dict,
+                        api_result: Optional[tuple] = None, trace: Trace = _NO_TRACE) -> Dict:
+        """
+        Run Layers 1 and 2 and fill in the result
+        
+        Images that no C2PA layer decided are left with final_verdict None
+        for the Layer-3 model.
+        
+        Args:
+            file_path: Path to file, or the file bytes
+            result: Result to fill in
+            api_result: Layer-1 (status, info, validation) already obtained
+                by the caller, after its own prefilter check
+            trace: Trace timing the stages
+        """
+        if api_result is None:
+            if self._apply_prefilter(file_path, result, trace):
+                return self._apply_format_fallback(file_path, result)
+            
+            # LAYER 1: Check C2PA API (in-process when the server would be local)
+            if self.in_process:
+                with trace.stage("api", mode="in_process"):
+                    api_result = self._check_in_process(file_path, stage=trace.stage)
+            else:
+                with trace.stage("api", mode="http"):
+                    api_result = self.check_c2pa_api(file_path) + (None,)
+        
+        api_status, api_info, validation = api_result
         result["api_status"] = api_status
         result["api_info"] = api_info
         
-        if api_status == "api_success":
+        # In-process results are settled below with Layer 2's signature checks
+        if api_status == "api_success" and not self.in_process:
             if api_info.get('aiDetected'):
                 result["final_verdict"] = "AI_DETECTED_C2PA_API"
                 result["confidence"] = "high"
@@ -113,7 +447,12 @@ class AIContentDetector:
                 return result
         
         # LAYER 2: Check embedded C2PA with platform detection
-        c2pa_status, c2pa_info = self.check_c2pa_embedded(file_path)
+        if self.in_process and api_status in ["api_success", "no_manifest_api"]:
+            # Layer 1 already ran the same validation
+            c2pa_status, c2pa_info = self._embedded_result(validation)
+        else:
+            with trace.stage("embedded"):
+                c2pa_status, c2pa_info = self.check_c2pa_embedded(file_path, stage=trace.stage)
         result["c2pa_status"] = c2pa_status
         result["c2pa_info"] = c2pa_info
         
@@ -126,8 +465,14 @@ class AIContentDetector:
             result["confidence"] = "high"
             return result
         
-        # LAYER 3: Fallback AI detection (images only)
-        file_ext = Path(file_path).suffix.lower()
+        return self._apply_format_fallback(file_path, result)
+    
+    def _apply_format_fallback(self, file_path: Union[str, bytes], result: Dict) -> Dict:
+        """Settle files no C2PA layer decided, by format"""
+        if isinstance(file_path, (bytes, bytearray, memoryview)):
+            file_ext = _SNIFFED_EXTENSIONS.get(sniff_mime_type(file_path), "")
+        else:
+            file_ext = Path(file_path).suffix.lower()
         
         # Video files - C2PA only, no fallback
         if file_ext in [".mp4", ".mov", ".avi", ".webm", ".mkv", ".flv", ".wmv"]:
@@ -135,24 +480,24 @@ class AIContentDetector:
             result["confidence"] = "none"
             return result
         
-        # Image files - C2PA + AI fallback
-        if file_ext in [".jpg", ".jpeg", ".png", ".webp"]:
-            detection_status, score = self.image_detector.detect(file_path)
-            result["detection_status"] = detection_status
-            result["detection_score"] = score
-            
-            if detection_status == "ai_likely":
-                result["final_verdict"] = "AI_LIKELY"
-                result["confidence"] = "medium"
-            elif detection_status == "human_likely":
-                result["final_verdict"] = "HUMAN_LIKELY"
-                result["confidence"] = "medium"
-            else:
-                result["final_verdict"] = "UNCERTAIN"
-                result["confidence"] = "low"
-        
-        else:
+        # Image files - C2PA + AI fallback (Layer 3, left pending)
+        if file_ext not in [".jpg", ".jpeg", ".png", ".webp"]:
             result["final_verdict"] = "UNSUPPORTED_FORMAT"
             result["confidence"] = "none"
         
         return result
+    
+    def _apply_detection(self, result: Dict, detection_status: str, score: float):
+        """Fill in the Layer-3 verdict"""
+        result["detection_status"] = detection_status
+        result["detection_score"] = score
+        
+        if detection_status == "ai_likely":
+            result["final_verdict"] = "AI_LIKELY"
+            result["confidence"] = "medium"
+        elif detection_status == "human_likely":
+            result["final_verdict"] = "HUMAN_LIKELY"
+            result["confidence"] = "medium"
+        else:
+            result["final_verdict"] = "UNCERTAIN"
+            result["confidence"] = "low"
@@ -0,0 +1,38 @@
+"""
+File Mapping Module
+Read-only, lazily paged access to files on disk
+"""
+
+import mmap
+from contextlib import contextmanager
+
+
+@contextmanager
+def map_file(file_path: str):
+    """
+    Memory-map a file for reading
+    
+    Pages are loaded by the OS only when touched, so walking container
+    headers or scanning a manifest store never pulls the whole file into
+    memory. The mapping supports the buffer protocol and can be handed
+    to the locator and marker scanner without copying.
+    
+    Args:
+        file_path: Path to file
+        
+    Yields:
+        Read-only mmap of the file (empty bytes for empty files)
+    """
+    with open(file_path, 'rb') as f:
+        try:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # Empty files cannot be mapped
+            mapped = None
+            
+        if mapped is None:
+            yield b''
+            return
+            
+        with mapped:
+            yield mapped
@@ -0,0 +1,333 @@
+"""
+Manifest Locator Module
+Finds the C2PA manifest store inside common containers without touching pixel data
+"""
+
+import struct
+import zlib
+from typing import List, Optional, Tuple
+
+from .file_map import map_file
+
+# UUID of the ISO-BMFF 'uuid' box that carries a C2PA manifest store
+C2PA_UUID = bytes.fromhex("d8fec3d61b0e483c92975828877ec481")
+
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+PNG_IEND = bytes.fromhex("0000000049454e44ae426082")
+
+
+def detect_container(data) -> Optional[str]:
+    """
+    Identify the container format from its header
+    
+    Args:
+        data: File bytes (any bytes-like object)
+        
+    Returns:
+        "png", "jpeg", "webp", "bmff" or None if unknown
+    """
+    if data[:8] == PNG_SIGNATURE:
+        return "png"
+    if data[:2] == b"\xff\xd8":
+        return "jpeg"
+    if data[:4] == b"RIFF" and data[8:12] == b"WEBP":
+        return "webp"
+    if data[4:8] == b"ftyp":
+        return "bmff"
+    return None
+
+
+def sniff_mime_type(data) -> Optional[str]:
+    """
+    Guess the MIME type from the file header
+    
+    Args:
+        data: File bytes (any bytes-like object)
+        
+    Returns:
+        MIME type, or None if unknown
+    """
+    container = detect_container(data)
+    if container == "png":
+        return "image/png"
+    if container == "jpeg":
+        return "image/jpeg"
+    if container == "webp":
+        return "image/webp"
+    if container == "bmff":
+        brand = bytes(data[8:12])
+        if brand == b"qt  ":
+            return "video/quicktime"
+        if brand in (b"heic", b"heix", b"mif1", b"msf1"):
+            return "image/heic"
+        if brand in (b"avif", b"avis"):
+            return "image/avif"
+        return "video/mp4"
+    
+    header = bytes(data[:12])
+    if header[:4] == b"GIF8":
+        return "image/gif"
+    if header[:4] in (b"II*\x00", b"MM\x00*"):
+        return "image/tiff"
+    if header[:4] == b"%PDF":
+        return "application/pdf"
+    if header[:4] == b"RIFF" and header[8:12] == b"WAVE":
+        return "audio/wav"
+    if header[:4] == b"RIFF" and header[8:12] == b"AVI ":
+        return "video/avi"
+    if header[:3] == b"ID3":
+        return "audio/mpeg"
+    return None
+
+
+def locate_manifest(data) -> Optional[List[Tuple[int, int]]]:
+    """
+    Find the byte ranges of the C2PA manifest store
+    
+    Only container headers are walked; compressed pixels and media
+    samples are skipped by their declared sizes.
+    
+    Args:
+        data: File bytes (any bytes-like object, e.g. bytes or mmap)
+        
+    Returns:
+        List of (start, end) ranges holding the manifest store, an empty
+        list if the container has no manifest, or None if the container is
+        unknown or malformed and the whole file has to be searched
+    """
+    walkers = {
+        "png": _walk_png,
+        "jpeg": _walk_jpeg,
+        "webp": _walk_webp,
+        "bmff": _walk_bmff,
+    }
+    walker = walkers.get(detect_container(data))
+    if walker is None:
+        return None
+        
+    try:
+        return walker(data)
+    except (struct.error, ValueError, IndexError):
+        return None
+
+
+def probe_manifest(file_path) -> Optional[bool]:
+    """
+    Cheap check for an embedded C2PA manifest
+    
+    Only the container headers are read (through a memory map), so this
+    answers in microseconds even for large videos.
+    
+    Args:
+        file_path: Path to file, or the file bytes
+        
+    Returns:
+        True if a manifest box is present, False if the container
+        definitely has none, None if the container is unknown
+    """
+    if isinstance(file_path, (bytes, bytearray, memoryview)):
+        ranges = locate_manifest(file_path)
+    else:
+        with map_file(file_path) as data:
+            ranges = locate_manifest(data)
+    
+    if ranges is None:
+        return None
+    return bool(ranges)
+
+
+def manifest_prefix(data) -> Optional[bytes]:
+    """
+    Cut a partially downloaded file down to a readable asset holding its manifest
+    
+    Succeeds once a manifest has been found and the walk has reached the
+    media payload behind it (for JPEG, as soon as the scan data starts,
+    since APP11 segments must precede it). The payload is dropped and the
+    container closed, so the c2pa library can still parse the result.
+    
+    Args:
+        data: Leading bytes of a file (any bytes-like object)
+        
+    Returns:
+        The closed-off asset, or None if reading further may add manifest data
+    """
+    walkers = {
+        "png": _walk_png,
+        "jpeg": _walk_jpeg,
+        "webp": _walk_webp,
+        "bmff": _walk_bmff,
+    }
+    container = detect_container(data)
+    walker = walkers.get(container)
+    if walker is None:
+        return None
+        
+    try:
+        payload = walker(data, prefix=True)
+    except (struct.error, ValueError, IndexError):
+        return None
+    if payload is None:
+        return None
+        
+    head = bytes(data[:payload])
+    if container == "png":
+        return head + PNG_IEND
+    if container == "jpeg":
+        return head + b"\xff\xd9"
+    if container == "webp":
+        return head[:4] + struct.pack("<I", len(head) - 8) + head[8:]
+    return head
+
+
+def png_chunk(kind: bytes, payload: bytes) -> bytes:
+    """
+    Encode one PNG chunk (length, type, payload and CRC)
+    
+    Args:
+        kind: Four-byte chunk type, e.g. b"caBX"
+        payload: Chunk data
+        
+    Returns:
+        The chunk bytes
+    """
+    return (struct.pack(">I", len(payload)) + kind + payload
+            + struct.pack(">I", zlib.crc32(kind + payload) & 0xFFFFFFFF))
+
+
+def manifest_region(data):
+    """
+    Get the bytes that can contain C2PA data
+    
+    Args:
+        data: File bytes (any bytes-like object)
+        
+    Returns:
+        The manifest store bytes, empty bytes if the container has no
+        manifest, or data itself if the container could not be walked
+    """
+    ranges = locate_manifest(data)
+    if ranges is None:
+        return data
+    return b"".join(data[start:end] for start, end in ranges)
+
+
+def _walk_png(data, prefix: bool = False):
+    """PNG: 'caBX' chunks (prefix: offset of the IDAT data after a manifest)"""
+    ranges = []
+    size = len(data)
+    pos = len(PNG_SIGNATURE)
+    
+    while pos + 8 <= size:
+        length, chunk_type = struct.unpack_from(">I4s", data, pos)
+        if prefix and ranges and chunk_type == b"IDAT":
+            return pos
+        start = pos + 8
+        end = start + length
+        if end + 4 > size:
+            break
+        if chunk_type == b"caBX":
+            ranges.append((start, end))
+        elif chunk_type == b"IEND":
+            return None if prefix else ranges
+        pos = end + 4  # skip CRC
+        
+    if prefix:
+        return None
+    return ranges or None
+
+
+def _walk_jpeg(data, prefix: bool = False):
+    """JPEG: APP11 segments carrying JUMBF, which must precede the scan data (prefix: offset of SOS)"""
+    ranges = []
+    size = len(data)
+    pos = 2
+    
+    while pos + 4 <= size:
+        if data[pos] != 0xFF:
+            break
+        marker = data[pos + 1]
+        if marker == 0xFF:  # fill byte
+            pos += 1
+            continue
+        if marker == 0x01 or 0xD0 <= marker <= 0xD7:  # standalone markers
+            pos += 2
+            continue
+        if marker in (0xDA, 0xD9):  # start of scan / end of image
+            return pos if prefix else ranges
+            
+        length = struct.unpack_from(">H", data, pos + 2)[0]
+        start = pos + 4
+        end = pos + 2 + length
+        if length < 2 or end > size:
+            break
+            
+        # CI 'JP', En (2 bytes), Z (4 bytes), then the JUMBF box
+        if marker == 0xEB and data[start:start + 2] == b"JP" and end - start > 16:
+            sequence = struct.unpack_from(">I", data, start + 4)[0]
+            box_start = start + 8
+            if sequence > 1:
+                # Continuation segments repeat the superbox header
+                box_start += 16 if struct.unpack_from(">I", data, box_start)[0] == 1 else 8
+            ranges.append((min(box_start, end), end))
+            
+        pos = end
+        
+    if prefix:
+        return None
+    return ranges or None
+
+
+def _walk_webp(data, prefix: bool = False):
+    """WebP: RIFF 'C2PA' chunks (prefix: offset of the image data after a manifest)"""
+    ranges = []
+    size = min(len(data), struct.unpack_from("<I", data, 4)[0] + 8)
+    pos = 12
+    
+    while pos + 8 <= size:
+        fourcc, length = struct.unpack_from("<4sI", data, pos)
+        if prefix and ranges and fourcc in (b"VP8 ", b"VP8L", b"ANMF"):
+            return pos
+        start = pos + 8
+        end = start + length
+        if end > size:
+            break
+        if fourcc == b"C2PA":
+            ranges.append((start, end))
+        pos = end + (length & 1)  # chunks are padded to even size
+        
+    if prefix:
+        return None
+    if pos >= size:
+        return ranges
+    return ranges or None
+
+
+def _walk_bmff(data, prefix: bool = False):
+    """ISO-BMFF (MP4, MOV, HEIF, AVIF): top-level C2PA 'uuid' boxes (prefix: offset of mdat after a manifest)"""
+    ranges = []
+    size = len(data)
+    pos = 0
+    
+    while pos + 8 <= size:
+        box_size, box_type = struct.unpack_from(">I4s", data, pos)
+        if prefix and ranges and box_type == b"mdat":
+            return pos
+        header = 8
+        if box_size == 1:
+            box_size = struct.unpack_from(">Q", data, pos + 8)[0]
+            header = 16
+        elif box_size == 0:  # box extends to end of file
+            box_size = size - pos
+        if box_size < header or pos + box_size > size:
+            break
+            
+        if box_type == b"uuid" and data[pos + header:pos + header + 16] == C2PA_UUID:
+            ranges.append((pos + header + 16, pos + box_size))
+            
+        pos += box_size
+        
+    if prefix:
+        return None
+    if pos == size:
+        return ranges
+    return ranges or None
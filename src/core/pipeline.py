@@ -0,0 +1,164 @@
+"""
+Validation Pipeline
+Shared C2PA validation used by the detector (Layers 1 and 2) and the API routes
+"""
+
+import mimetypes
+from contextlib import nullcontext
+from typing import Callable, ContextManager, Dict, Optional, Union
+
+from .c2pa_reader import C2PAReader
+from .file_map import map_file
+from .locator import manifest_region, sniff_mime_type
+from ..platforms.registry import PlatformRegistry
+
+
+def _no_stage(name: str) -> ContextManager:
+    """Stage hook that records nothing"""
+    return nullcontext()
+
+
+class ValidationPipeline:
+    """
+    One C2PA validation pass over a file or in-memory bytes
+    
+    The asset is parsed once; platform markers are searched in the manifest
+    store only; the platform extractor fills in the metadata and the
+    signature is validated from the same parse.
+    """
+    
+    def __init__(self, platform_registry: Optional[PlatformRegistry] = None,
+                 c2pa_reader: Optional[C2PAReader] = None):
+        """
+        Args:
+            platform_registry: Registry to detect platforms with (new one if None)
+            c2pa_reader: Reader to parse manifests with (new one if None)
+        """
+        self.platform_registry = platform_registry or PlatformRegistry()
+        self.c2pa_reader = c2pa_reader or C2PAReader()
+    
+    def validate(self, source: Union[str, bytes], mime_type: Optional[str] = None,
+                 check_signature: bool = True,
+                 stage: Optional[Callable[[str], ContextManager]] = None,
+                 filename: Optional[str] = None) -> Optional[Dict]:
+        """
+        Validate an asset
+        
+        Args:
+            source: Path to file, or the file bytes
+            mime_type: Declared MIME type of bytes (the sniffed type wins when known)
+            check_signature: Whether to validate the signature
+            stage: Called with each stage name ("manifest_read",
+                "platform_detection", "extraction", "signature_validation");
+                returns a context manager wrapped around that stage
+            filename: Original name of bytes, whose extension gives the type
+                when it can neither be sniffed nor is declared specifically
+                
+        Returns:
+            Dict with platform, company, metadata, ai_generated and
+            signature_valid, or None if no platform was recognized
+        """
+        stage = stage or _no_stage
+        in_memory = isinstance(source, (bytes, bytearray, memoryview))
+        if in_memory:
+            mime_type = sniff_mime_type(source) or mime_type
+            if filename and mime_type in (None, "", "application/octet-stream"):
+                # Formats the sniffer does not know (SVG, JPEG XL, MP3, DOCX...)
+                mime_type = mimetypes.guess_type(filename)[0] or mime_type
+            
+        # Open the asset once for manifest reading and validation
+        with stage("manifest_read"):
+            session = self.c2pa_reader.open_session(source, mime_type)
+            manifest = session.manifest
+            
+        try:
+            if in_memory:
+                return self._validate_session(session, manifest, source, check_signature, stage)
+                
+            # Map the file instead of reading it; only touched pages are loaded
+            with map_file(source) as raw_data:
+                return self._validate_session(session, manifest, raw_data, check_signature, stage)
+        finally:
+            session.close()
+    
+    def _validate_session(self, session, manifest: Optional[Dict], raw_data,
+                          check_signature: bool, stage) -> Optional[Dict]:
+        """Platform detection, extraction and signature check on one open session"""
+        with stage("platform_detection"):
+            # Only the manifest store can carry platform markers
+            region = manifest_region(raw_data)
+            
+            # Single marker scan shared by detection and extraction
+            hits = self.platform_registry.scan(region)
+            platform_name, extractor = self.platform_registry.detect_platform(manifest, region, hits)
+            
+        if platform_name == "unknown":
+            return None
+            
+        with stage("extraction"):
+            # Extract metadata using platform-specific extractor
+            metadata = extractor.extract_metadata(manifest, region, markers=hits.get(platform_name, []))
+            
+            # Check if AI-generated
+            is_ai = extractor.is_ai_generated(metadata)
+            
+        # Validate signature if manifest available
+        signature_valid = False
+        if check_signature and manifest:
+            with stage("signature_validation"):
+                signature_valid, _ = session.validate_signature()
+                
+        return {
+            "platform": platform_name,
+            "company": metadata.get("company", "Unknown"),
+            "metadata": metadata,
+            "ai_generated": is_ai,
+            "signature_valid": signature_valid
+        }
+
+
+def api_fields(validation: Optional[Dict]) -> Optional[Dict]:
+    """
+    Convert a pipeline result to the API's field names
+    
+    Args:
+        validation: Output of ValidationPipeline.validate
+        
+    Returns:
+        Dict with platform, company, metadata, aiDetected and
+        signatureValid, or None if no platform was recognized
+    """
+    if validation is None:
+        return None
+    return {
+        "platform": validation["platform"],
+        "company": validation["company"],
+        "metadata": validation["metadata"],
+        "aiDetected": validation["ai_generated"],
+        "signatureValid": validation["signature_valid"]
+    }
+
+
+def api_response(fields: Optional[Dict]) -> Dict:
+    """
+    Shape a validation result like the /validate/file response
+    
+    Args:
+        fields: Output of api_fields
+        
+    Returns:
+        Response body
+    """
+    if fields is None:
+        return {
+            "isValid": False,
+            "message": "No C2PA manifest or platform not recognized",
+            "aiDetected": None,
+            "signatureValid": False
+        }
+        
+    return {
+        "isValid": True,
+        **fields,
+        "message": "AI-generated content detected" if fields["aiDetected"] else "Human-created content"
+    }
@@ -0,0 +1,242 @@
+"""
+Tracing Module
+Per-stage timings and pluggable spans for detector analyses
+"""
+
+import time
+import threading
+from contextlib import contextmanager, nullcontext
+from typing import Any, Callable, ContextManager, Dict, Iterator, List, Optional
+
+
+class Span:
+    """
+    One timed stage of an analysis
+    
+    Durations come from time.perf_counter, so they are monotonic and only
+    meaningful relative to each other.
+    """
+    
+    def __init__(self, name: str, parent: Optional["Span"] = None,
+                 attributes: Optional[Dict[str, Any]] = None):
+        self.name = name
+        self.parent = parent
+        self.attributes = dict(attributes or {})
+        self.start = time.perf_counter()
+        self.end = None
+        self.error = None
+        # Backend object (e.g. an OpenTelemetry span) owned by the tracer
+        self.handle = None
+    
+    @property
+    def duration(self) -> Optional[float]:
+        """Seconds from start to end, None while running"""
+        if self.end is None:
+            return None
+        return self.end - self.start
+    
+    def set_attribute(self, key: str, value: Any):
+        """Attach a key/value to the span"""
+        self.attributes[key] = value
+
+
+class Tracer:
+    """
+    Receives the spans of every analysis
+    
+    The base class records nothing. Subclasses override start_span and
+    end_span to forward spans to a tracing system; they are called from
+    whichever thread runs the stage.
+    """
+    
+    def start_span(self, span: Span):
+        """Called when a stage starts"""
+    
+    def end_span(self, span: Span):
+        """Called when a stage ends (span.end and span.error are set)"""
+
+
+class CallbackTracer(Tracer):
+    """Tracer that hands every finished span to a callback"""
+    
+    def __init__(self, callback: Callable[[Span], None]):
+        """
+        Args:
+            callback: Called with each finished span
+        """
+        self.callback = callback
+    
+    def end_span(self, span: Span):
+        self.callback(span)
+
+
+class OpenTelemetryTracer(Tracer):
+    """Tracer that mirrors spans into OpenTelemetry (opentelemetry-api required)"""
+    
+    def __init__(self, name: str = "ai-content-detector", tracer=None):
+        """
+        Args:
+            name: Instrumentation name for trace.get_tracer
+            tracer: OpenTelemetry tracer to use instead of the global one
+        """
+        from opentelemetry import trace
+        
+        self._trace = trace
+        self._tracer = tracer or trace.get_tracer(name)
+    
+    def start_span(self, span: Span):
+        context = None
+        if span.parent is not None and span.parent.handle is not None:
+            context = self._trace.set_span_in_context(span.parent.handle)
+        span.handle = self._tracer.start_span(
+            span.name, context=context,
+            start_time=time.time_ns() - int((time.perf_counter() - span.start) * 1e9))
+    
+    def end_span(self, span: Span):
+        if span.handle is None:
+            return
+        for key, value in span.attributes.items():
+            if value is not None:
+                span.handle.set_attribute(key, value if isinstance(value, (bool, int, float, str)) else str(value))
+        if span.error is not None:
+            span.handle.record_exception(span.error)
+            span.handle.set_status(self._trace.Status(self._trace.StatusCode.ERROR, str(span.error)))
+        span.handle.end()
+
+
+_global_tracer = None
+_global_lock = threading.Lock()
+
+
+def set_tracer(tracer: Optional[Tracer]):
+    """
+    Install the tracer used by detectors that were not given one
+    
+    Args:
+        tracer: Tracer instance, or None to stop tracing
+    """
+    global _global_tracer
+    with _global_lock:
+        _global_tracer = tracer
+
+
+def get_tracer() -> Optional[Tracer]:
+    """Get the globally installed tracer, if any"""
+    return _global_tracer
+
+
+class Trace:
+    """
+    Timings and spans of one analysis
+    
+    Stages nest: a stage opened inside another becomes its child span and
+    its timing key is prefixed with the parent's ("api.manifest_read").
+    Repeated stages add up. With no tracer and recording off every stage
+    is a no-op, so an untraced analysis pays almost nothing.
+    """
+    
+    def __init__(self, name: str, tracer: Optional[Tracer] = None, record: bool = False,
+                 attributes: Optional[Dict[str, Any]] = None):
+        """
+        Args:
+            name: Root span name ("analyze_file")
+            tracer: Tracer receiving spans (optional)
+            record: Whether to collect timings for the result
+            attributes: Root span attributes (e.g. the file)
+        """
+        self.tracer = tracer
+        self.record = record
+        self.enabled = record or tracer is not None
+        self.timings: Dict[str, float] = {}
+        self._stack: List[tuple] = []
+        self.root = None
+        if self.enabled:
+            self.root = self._start(name, attributes)
+    
+    def _start(self, name: str, attributes: Optional[Dict[str, Any]],
+               start: Optional[float] = None) -> Span:
+        """Open a span under the current one"""
+        parent = self._stack[-1][0] if self._stack else self.root
+        span = Span(name, parent, attributes)
+        if start is not None:
+            span.start = start
+        if self.tracer is not None:
+            self.tracer.start_span(span)
+        return span
+    
+    def _end(self, span: Span, error: Optional[BaseException] = None,
+             end: Optional[float] = None):
+        """Close a span"""
+        span.end = time.perf_counter() if end is None else end
+        span.error = error
+        if self.tracer is not None:
+            self.tracer.end_span(span)
+    
+    def stage(self, name: str, **attributes) -> ContextManager:
+        """Time a stage: with trace.stage("prefilter"): ..."""
+        if not self.enabled:
+            return nullcontext()
+        return self._stage(name, attributes)
+    
+    @contextmanager
+    def _stage(self, name: str, attributes: Dict[str, Any]) -> Iterator[Span]:
+        """Open a child span, time it and record it"""
+        key = f"{self._stack[-1][1]}.{name}" if self._stack else name
+        if self.record:
+            # Reserve the key so timings list stages in the order they started
+            self.timings.setdefault(key, 0.0)
+        span = self._start(name, attributes)
+        self._stack.append((span, key))
+        try:
+            yield span
+        except BaseException as e:
+            self._stack.pop()
+            self._end(span, e)
+            self._add(key, span.duration)
+            raise
+        self._stack.pop()
+        self._end(span)
+        self._add(key, span.duration)
+    
+    def add_stage(self, name: str, start: float, end: float, **attributes):
+        """
+        Record a stage timed elsewhere, e.g. a model call shared by a batch
+        
+        Args:
+            name: Stage name
+            start: time.perf_counter() when the stage started
+            end: time.perf_counter() when it ended
+            attributes: Span attributes
+        """
+        if not self.enabled:
+            return
+        key = f"{self._stack[-1][1]}.{name}" if self._stack else name
+        span = self._start(name, attributes, start)
+        self._end(span, end=end)
+        self._add(key, span.duration)
+    
+    def _add(self, key: str, duration: float):
+        """Accumulate a stage duration"""
+        if self.record:
+            self.timings[key] = self.timings.get(key, 0.0) + duration
+    
+    def finish(self, result: Dict) -> Dict:
+        """
+        Close the root span and attach timings to the result
+        
+        Args:
+            result: Analysis result
+            
+        Returns:
+            The result, with a "timings" section (seconds) if recording
+        """
+        if self.root is not None and self.root.end is None:
+            self.root.set_attribute("final_verdict", result.get("final_verdict"))
+            self._end(self.root)
+            if self.record:
+                self.timings["total"] = self.root.duration
+        if self.record:
+            result["timings"] = {key: round(value, 6) for key, value in self.timings.items()}
+        else:
+            result.pop("timings", None)
+        return result
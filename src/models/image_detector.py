@@ -3,16 +3,33 @@ Image AI Detection Model
 Wrapper for image-based AI detection
 """
 
-from typing import Tuple
+import io
+import threading
+import importlib.util
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Sequence, Tuple, Union
 
 
 class ImageDetector:
-    """AI detection for image content"""
+    """
+    AI detection for image content
     
-    def __init__(self):
+    The transformers model is loaded the first time detection runs, so
+    callers whose verdicts come from C2PA never pay for torch import or
+    model load.
+    """
+    
+    def __init__(self, prewarm: bool = False):
         self.detector = None
-        self.available = False
-        self._init_detector()
+        self.available = all(
+            importlib.util.find_spec(module) is not None
+            for module in ("transformers", "torch", "PIL")
+        )
+        self._loaded = False
+        self._lock = threading.Lock()
+        
+        if prewarm:
+            self.prewarm()
     
     def _init_detector(self):
         """Initialize image detection model"""
@@ -26,14 +43,46 @@ class ImageDetector:
             )
             self.available = True
         except ImportError:
-            pass
+            self.available = False
         except Exception:
-            pass
+            self.available = False
+    
+    def _ensure_loaded(self) -> bool:
+        """Load the model once, thread-safe; returns whether it is usable"""
+        if not self._loaded:
+            with self._lock:
+                if not self._loaded:
+                    if self.available:
+                        self._init_detector()
+                    self._loaded = True
+        return self.detector is not None
+    
+    def prewarm(self, background: bool = True) -> Optional[threading.Thread]:
+        """
+        Load the model ahead of the first detection
+        
+        Args:
+            background: Load in a daemon thread instead of blocking
+            
+        Returns:
+            The loading thread, or None if loaded synchronously
+        """
+        if not background:
+            self._ensure_loaded()
+            return None
+        
+        thread = threading.Thread(target=self._ensure_loaded, name="image-detector-prewarm", daemon=True)
+        thread.start()
+        return thread
     
     def is_available(self) -> bool:
-        """Check if detector is available"""
+        """Check if detector is available (does not load the model)"""
         return self.available
     
+    def is_loaded(self) -> bool:
+        """Check if the model has been loaded"""
+        return self._loaded and self.detector is not None
+    
     def detect(self, file_path: str) -> Tuple[str, float]:
         """
         Detect if image is AI-generated
@@ -44,31 +93,100 @@ class ImageDetector:
         Returns:
             Tuple of (status, confidence_score)
         """
-        if not self.available:
+        if not self._ensure_loaded():
             return "unavailable", 0.0
         
         try:
-            from PIL import Image
-            
-            image = Image.open(file_path).convert('RGB')
+            image = self._load_image(file_path)
             results = self.detector(image)
-            
-            result = results[0]
-            label = result["label"].lower()
-            score = result["score"]
-            
-            if "artificial" in label or "ai" in label or "fake" in label:
-                ai_score = score
-            else:
-                ai_score = 1 - score
-            
-            threshold = 0.55
-            if ai_score >= threshold:
-                return "ai_likely", ai_score
-            elif ai_score <= (1 - threshold):
-                return "human_likely", 1 - ai_score
-            else:
-                return "uncertain", ai_score
+            return self._classify(results[0])
                 
         except Exception:
             return "error", 0.0
+    
+    def detect_batch(self, items: Sequence[Union[str, bytes]], batch_size: int = 8,
+                     workers: Optional[int] = None) -> List[Tuple[str, float]]:
+        """
+        Detect AI generation for many images with batched inference
+        
+        Images are decoded in parallel threads one batch at a time, the next
+        batch decoding while the current one is classified, so at most two
+        batches of decoded images are held in memory.
+        
+        Args:
+            items: Image file paths or raw image bytes
+            batch_size: Images per forward pass
+            workers: Decoding threads (default: executor default)
+            
+        Returns:
+            List of (status, confidence_score), one per item, in input order
+        """
+        if not items:
+            return []
+        if not self._ensure_loaded():
+            return [("unavailable", 0.0)] * len(items)
+        
+        results = []
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            # Decode in parallel; PIL releases the GIL while decoding
+            def decode(start):
+                return [pool.submit(self._load_image_safely, item)
+                        for item in items[start:start + batch_size]]
+            
+            upcoming = decode(0)
+            for start in range(0, len(items), batch_size):
+                images = [future.result() for future in upcoming]
+                upcoming = decode(start + batch_size)
+                results.extend(self._classify_batch(images))
+        
+        return results
+    
+    def _classify_batch(self, images: List) -> List[Tuple[str, float]]:
+        """Classify decoded images (None for undecodable ones) in one forward pass"""
+        results = [("error", 0.0)] * len(images)
+        loaded = [(index, image) for index, image in enumerate(images) if image is not None]
+        if not loaded:
+            return results
+        
+        try:
+            outputs = self.detector([image for _, image in loaded], batch_size=len(loaded))
+            for (index, _), output in zip(loaded, outputs):
+                results[index] = self._classify(output[0])
+        except Exception:
+            # Leave this batch as errors; other batches are unaffected
+            pass
+        
+        return results
+    
+    def _load_image(self, item: Union[str, bytes]):
+        """Open an image from a path or raw bytes as RGB"""
+        from PIL import Image
+        
+        if isinstance(item, (bytes, bytearray, memoryview)):
+            item = io.BytesIO(item)
+        return Image.open(item).convert('RGB')
+    
+    def _load_image_safely(self, item: Union[str, bytes]):
+        """Open an image, returning None if it cannot be decoded"""
+        try:
+            return self._load_image(item)
+        except Exception:
+            return None
+    
+    def _classify(self, result: Dict) -> Tuple[str, float]:
+        """Map the top model prediction to (status, confidence_score)"""
+        label = result["label"].lower()
+        score = result["score"]
+        
+        if "artificial" in label or "ai" in label or "fake" in label:
+            ai_score = score
+        else:
+            ai_score = 1 - score
+        
+        threshold = 0.55
+        if ai_score >= threshold:
+            return "ai_likely", ai_score
+        elif ai_score <= (1 - threshold):
+            return "human_likely", 1 - ai_score
+        else:
+            return "uncertain", ai_score
@@ -3,7 +3,7 @@ TEMPLATE for Adding New Platform
 Copy this file and rename it to your platform name (e.g., midjourney.py)
 """
 
-from typing import Dict, List
+from typing import Dict, List, Optional
 from .base import BasePlatformExtractor
 
 
@@ -34,7 +34,8 @@ class NewPlatformExtractor(BasePlatformExtractor):
             "generative"
         ]
     
-    def extract_metadata(self, manifest: Dict, raw_data: bytes) -> Dict:
+    def extract_metadata(self, manifest: Dict, raw_data: bytes,
+                         markers: Optional[List[str]] = None) -> Dict:
         """
         Extract platform-specific metadata
         
@@ -69,7 +70,7 @@ class NewPlatformExtractor(BasePlatformExtractor):
                 # Add your logic here
         
         # Fallback: Search raw data
-        found_markers = self.search_raw_data(raw_data)
+        found_markers = self.resolve_markers(raw_data, markers)
         if found_markers:
             metadata["detected_markers"] = found_markers
             
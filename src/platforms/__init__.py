@@ -8,11 +8,13 @@ from .google import GoogleExtractor
 from .adobe import AdobeExtractor
 from .microsoft import MicrosoftExtractor
 from .base import BasePlatformExtractor
+from .scanner import MarkerScanner
 
 __all__ = [
     'OpenAIExtractor',
     'GoogleExtractor',
     'AdobeExtractor',
     'MicrosoftExtractor',
-    'BasePlatformExtractor'
+    'BasePlatformExtractor',
+    'MarkerScanner'
 ]
@@ -3,7 +3,7 @@ Adobe C2PA Extractor
 Handles: Adobe Firefly, Photoshop, Illustrator
 """
 
-from typing import Dict, List
+from typing import Dict, List, Optional
 from .base import BasePlatformExtractor
 
 
@@ -28,7 +28,8 @@ class AdobeExtractor(BasePlatformExtractor):
             "ai_generated"
         ]
     
-    def extract_metadata(self, manifest: Dict, raw_data: bytes) -> Dict:
+    def extract_metadata(self, manifest: Dict, raw_data: bytes,
+                         markers: Optional[List[str]] = None) -> Dict:
         """Extract Adobe-specific metadata"""
         metadata = {
             "company": self.company_name,
@@ -57,7 +58,7 @@ class AdobeExtractor(BasePlatformExtractor):
                     metadata["ai_feature"] = "Generative AI"
         
         # Fallback: Search raw data
-        found_markers = self.search_raw_data(raw_data)
+        found_markers = self.resolve_markers(raw_data, markers)
         if found_markers:
             metadata["detected_markers"] = found_markers
             
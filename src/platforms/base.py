@@ -5,6 +5,8 @@ Base class for platform-specific C2PA extractors
 from typing import Dict, List, Optional
 from abc import ABC, abstractmethod
 
+from .scanner import MarkerScanner
+
 
 class BasePlatformExtractor(ABC):
     """Base class for all platform extractors"""
@@ -13,15 +15,18 @@ class BasePlatformExtractor(ABC):
         self.company_name = "Unknown"
         self.markers = []  # Text markers to search for
         self.ai_indicators = []  # AI-specific indicators
+        self._scanner = None
     
     @abstractmethod
-    def extract_metadata(self, manifest: Dict, raw_data: bytes) -> Dict:
+    def extract_metadata(self, manifest: Dict, raw_data: bytes,
+                         markers: Optional[List[str]] = None) -> Dict:
         """
         Extract platform-specific metadata
         
         Args:
             manifest: Parsed C2PA manifest (if available)
             raw_data: Raw file bytes for fallback extraction
+            markers: Markers already found by the registry scan (skips rescanning raw_data)
             
         Returns:
             Dictionary with extracted metadata
@@ -51,17 +56,27 @@ class BasePlatformExtractor(ABC):
         Returns:
             List of found markers
         """
-        try:
-            text_data = raw_data.decode('latin-1', errors='ignore')
-            found = []
-            
-            for marker in self.markers:
-                if marker in text_data:
-                    found.append(marker)
+        scanner = self._scanner
+        if scanner is None or scanner.markers.get(self.company_name) != self.markers:
+            scanner = MarkerScanner({self.company_name: self.markers})
+            self._scanner = scanner
+        
+        return scanner.scan(raw_data).get(self.company_name, [])
+    
+    def resolve_markers(self, raw_data: bytes, markers: Optional[List[str]] = None) -> List[str]:
+        """
+        Use markers found by the registry scan, or search raw data if none were given
+        
+        Args:
+            raw_data: Raw file bytes
+            markers: Markers already found for this platform
             
-            return found
-        except:
-            return []
+        Returns:
+            List of found markers
+        """
+        if markers is not None:
+            return markers
+        return self.search_raw_data(raw_data)
     
     def get_company_name(self) -> str:
         """Get the company name"""
@@ -3,7 +3,7 @@ Google C2PA Extractor
 Handles: Google Media Processing Services, Gemini, Pixel Camera
 """
 
-from typing import Dict, List
+from typing import Dict, List, Optional
 from .base import BasePlatformExtractor
 
 
@@ -30,7 +30,8 @@ class GoogleExtractor(BasePlatformExtractor):
             "generative"
         ]
     
-    def extract_metadata(self, manifest: Dict, raw_data: bytes) -> Dict:
+    def extract_metadata(self, manifest: Dict, raw_data: bytes,
+                         markers: Optional[List[str]] = None) -> Dict:
         """Extract Google-specific metadata"""
         metadata = {
             "company": self.company_name,
@@ -59,7 +60,7 @@ class GoogleExtractor(BasePlatformExtractor):
                     metadata["certificate"] = sig_info["common_name"]
         
         # Fallback: Search raw data
-        found_markers = self.search_raw_data(raw_data)
+        found_markers = self.resolve_markers(raw_data, markers)
         if found_markers:
             metadata["detected_markers"] = found_markers
             
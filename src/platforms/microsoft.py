@@ -3,7 +3,7 @@ Microsoft C2PA Extractor
 Handles: Microsoft Designer, Bing Image Creator, Copilot
 """
 
-from typing import Dict, List
+from typing import Dict, List, Optional
 from .base import BasePlatformExtractor
 
 
@@ -27,7 +27,8 @@ class MicrosoftExtractor(BasePlatformExtractor):
             "copilot"
         ]
     
-    def extract_metadata(self, manifest: Dict, raw_data: bytes) -> Dict:
+    def extract_metadata(self, manifest: Dict, raw_data: bytes,
+                         markers: Optional[List[str]] = None) -> Dict:
         """Extract Microsoft-specific metadata"""
         metadata = {
             "company": self.company_name,
@@ -53,7 +54,7 @@ class MicrosoftExtractor(BasePlatformExtractor):
                         metadata["company"] = sig_info["issuer"]
         
         # Fallback: Search raw data
-        found_markers = self.search_raw_data(raw_data)
+        found_markers = self.resolve_markers(raw_data, markers)
         if found_markers:
             metadata["detected_markers"] = found_markers
             
@@ -3,7 +3,7 @@ OpenAI / ChatGPT C2PA Extractor
 Handles: ChatGPT, DALL-E, GPT-4, Sora
 """
 
-from typing import Dict, List
+from typing import Dict, List, Optional
 from .base import BasePlatformExtractor
 
 
@@ -29,7 +29,8 @@ class OpenAIExtractor(BasePlatformExtractor):
             "generativeType"
         ]
     
-    def extract_metadata(self, manifest: Dict, raw_data: bytes) -> Dict:
+    def extract_metadata(self, manifest: Dict, raw_data: bytes,
+                         markers: Optional[List[str]] = None) -> Dict:
         """Extract OpenAI-specific metadata"""
         metadata = {
             "company": self.company_name,
@@ -108,7 +109,7 @@ class OpenAIExtractor(BasePlatformExtractor):
                 metadata["assertions"] = assertion_labels
         
         # Fallback: Search raw data
-        found_markers = self.search_raw_data(raw_data)
+        found_markers = self.resolve_markers(raw_data, markers)
         if found_markers:
             metadata["detected_markers"] = found_markers
             
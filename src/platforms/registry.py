@@ -5,6 +5,7 @@ Manages all platform extractors and provides unified interface
 
 from typing import Dict, List, Optional, Tuple
 from .base import BasePlatformExtractor
+from .scanner import MarkerScanner
 from .openai import OpenAIExtractor
 from .google import GoogleExtractor
 from .adobe import AdobeExtractor
@@ -21,24 +22,60 @@ class PlatformRegistry:
             "adobe": AdobeExtractor(),
             "microsoft": MicrosoftExtractor()
         }
+        self._scanner = None
     
-    def detect_platform(self, manifest: Optional[Dict], raw_data: bytes) -> Tuple[str, BasePlatformExtractor]:
+    @property
+    def scanner(self) -> MarkerScanner:
+        """Compiled marker scanner for all registered platforms (rebuilt when platforms change)"""
+        markers = {name: extractor.markers for name, extractor in self.extractors.items()}
+        if self._scanner is None or self._scanner.markers != markers:
+            self._scanner = MarkerScanner(markers)
+        return self._scanner
+    
+    def compile(self) -> MarkerScanner:
+        """
+        Build the marker scanner now instead of on the first scan
+        
+        Called before forking server workers so they inherit the compiled
+        scanner rather than each building their own.
+        
+        Returns:
+            The compiled scanner
+        """
+        return self.scanner
+    
+    def scan(self, raw_data: bytes) -> Dict[str, List[str]]:
+        """
+        Search raw data for the markers of every platform in a single pass
+        
+        Args:
+            raw_data: Raw file bytes
+            
+        Returns:
+            Mapping of platform name to found markers
+        """
+        return self.scanner.scan(raw_data)
+    
+    def detect_platform(self, manifest: Optional[Dict], raw_data: bytes,
+                        hits: Optional[Dict[str, List[str]]] = None) -> Tuple[str, BasePlatformExtractor]:
         """
         Detect which platform created the content
         
         Args:
             manifest: Parsed C2PA manifest (if available)
             raw_data: Raw file bytes
+            hits: Result of scan() for raw_data (scanned here if not given)
             
         Returns:
             Tuple of (platform_name, extractor_instance)
         """
+        if hits is None:
+            hits = self.scan(raw_data)
+        
         # Try each extractor
         for platform_name, extractor in self.extractors.items():
-            # Search for markers in raw data
-            found_markers = extractor.search_raw_data(raw_data)
-            
-            if found_markers:
+            # Check markers found in raw data
+            if hits.get(platform_name):
                 return platform_name, extractor
             
             # Also check manifest if available
@@ -51,7 +88,8 @@ class PlatformRegistry:
         
         return "unknown", None
     
-    def extract_metadata(self, platform_name: str, manifest: Optional[Dict], raw_data: bytes) -> Dict:
+    def extract_metadata(self, platform_name: str, manifest: Optional[Dict], raw_data: bytes,
+                         hits: Optional[Dict[str, List[str]]] = None) -> Dict:
         """
         Extract metadata using specific platform extractor
         
@@ -59,13 +97,15 @@ class PlatformRegistry:
             platform_name: Name of the platform
             manifest: Parsed C2PA manifest
             raw_data: Raw file bytes
+            hits: Result of scan() for raw_data, so the data is not scanned again
             
         Returns:
             Extracted metadata dictionary
         """
         if platform_name in self.extractors:
             extractor = self.extractors[platform_name]
-            return extractor.extract_metadata(manifest, raw_data)
+            markers = hits.get(platform_name, []) if hits is not None else None
+            return extractor.extract_metadata(manifest, raw_data, markers=markers)
         
         return {"company": "Unknown", "error": "Platform not found"}
     
@@ -0,0 +1,112 @@
+"""
+Marker Scanner
+Single-pass multi-pattern search for platform markers in raw binary data
+"""
+
+import re
+from typing import Dict, Iterable, List, Tuple
+
+
+class MarkerScanner:
+    """
+    Compiled matcher for the markers of many platforms at once
+    
+    All markers are compiled into one prefix-trie regex and matched
+    directly against the bytes, so the data is scanned in a single pass
+    no matter how many platforms are registered. Markers that are
+    contained in a longer match (e.g. "GPT-4" inside "GPT-4o") are resolved
+    from a precomputed containment table instead of rescanning.
+    """
+    
+    def __init__(self, markers: Dict[str, Iterable[str]]):
+        """
+        Args:
+            markers: Mapping of platform name to its text markers
+        """
+        self.markers = {name: list(values) for name, values in markers.items()}
+        
+        # Markers are matched as latin-1 bytes, which is exactly what the
+        # previous decode('latin-1') + substring search did
+        self._owners: Dict[bytes, List[Tuple[str, str]]] = {}
+        for name, values in self.markers.items():
+            for marker in values:
+                try:
+                    needle = marker.encode('latin-1')
+                except UnicodeEncodeError:
+                    continue
+                if needle:
+                    self._owners.setdefault(needle, []).append((name, marker))
+                    
+        needles = sorted(self._owners, key=len, reverse=True)
+        self._contained = {
+            needle: [other for other in needles if other in needle]
+            for needle in needles
+        }
+        self._pattern = re.compile(_trie_pattern(needles)) if needles else None
+    
+    def scan(self, raw_data) -> Dict[str, List[str]]:
+        """
+        Find the markers of every platform in one pass
+        
+        Args:
+            raw_data: Raw file bytes (any bytes-like object)
+            
+        Returns:
+            Mapping of platform name to found markers, in each platform's
+            marker order. Platforms without hits are omitted.
+        """
+        if self._pattern is None:
+            return {}
+            
+        seen = set()
+        search = self._pattern.search
+        pos = 0
+        
+        try:
+            match = search(raw_data, pos)
+            while match is not None:
+                seen.update(self._contained[match.group()])
+                if len(seen) == len(self._owners):
+                    break
+                # Restart one byte later so overlapping markers are not lost
+                match = search(raw_data, match.start() + 1)
+        except TypeError:
+            return {}
+            
+        found: Dict[str, set] = {}
+        for needle in seen:
+            for name, marker in self._owners[needle]:
+                found.setdefault(name, set()).add(marker)
+                
+        return {
+            name: [marker for marker in values if marker in found[name]]
+            for name, values in self.markers.items()
+            if name in found
+        }
+
+
+def _trie_pattern(needles: Iterable[bytes]) -> bytes:
+    """
+    Build a regex from a prefix trie of the needles
+    
+    Shared prefixes are matched once and the longest needle at a position
+    wins, which keeps the per-byte cost flat as markers are added.
+    """
+    root: Dict = {}
+    for needle in needles:
+        node = root
+        for byte in needle:
+            node = node.setdefault(byte, {})
+        node[None] = True
+    
+    def emit(node: Dict) -> bytes:
+        branches = [re.escape(bytes([byte])) + emit(node[byte])
+                    for byte in sorted(key for key in node if key is not None)]
+        if not branches:
+            return b''
+        body = branches[0] if len(branches) == 1 else b'(?:' + b'|'.join(branches) + b')'
+        if None in node:
+            body = b'(?:' + body + b')?'
+        return body
+        
+    return emit(root)
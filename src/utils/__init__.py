@@ -2,6 +2,6 @@
 Utility Functions
 """
 
-from .console import print_result, print_initialization_status
+from .console import print_result, print_initialization_status, print_batch_line, print_batch_summary
 
-__all__ = ['print_result', 'print_initialization_status']
+__all__ = ['print_result', 'print_initialization_status', 'print_batch_line', 'print_batch_summary']
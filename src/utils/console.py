@@ -32,11 +32,16 @@ def print_result(result: Dict):
         print("   This video does not contain C2PA credentials")
         print("\n🎯 VERDICT: NO_C2PA_FOUND")
         print("   Note: Video AI detection is not available")
+        _print_timings(result)
         print("="*60 + "\n")
         return
     
+    # Prefilter decision
+    if result.get("prefilter") == "no_manifest":
+        print("\n⚡ Prefilter: no C2PA manifest in file (C2PA layers skipped)")
+    
     # API status
-    if result.get("api_status") and result["api_status"] != "api_unavailable":
+    if result.get("api_status") and result["api_status"] not in ["api_unavailable", "skipped"]:
         print(f"\n🌐 C2PA API: {result['api_status']}")
         if result["api_info"]:
             info = result["api_info"]
@@ -117,9 +122,21 @@ def print_result(result: Dict):
     
     print(f"\n🎯 VERDICT: {result['final_verdict']}")
     print(f"   Confidence: {result['confidence']}")
+    _print_timings(result)
     print("="*60 + "\n")
 
 
+def _print_timings(result: Dict):
+    """Print per-stage timings if the result has them"""
+    timings = result.get("timings")
+    if not timings:
+        return
+    print("\n⏱️  Timings:")
+    for stage, seconds in timings.items():
+        indent = "   " + "  " * stage.count(".")
+        print(f"{indent}{stage.rsplit('.', 1)[-1]}: {seconds * 1000:.2f} ms")
+
+
 def print_initialization_status(c2pa_available: bool, detector_available: bool):
     """
     Print initialization status
@@ -134,6 +151,33 @@ def print_initialization_status(c2pa_available: bool, detector_available: bool):
         print("⚠ C2PA library not found. Install: pip install c2pa-python")
     
     if detector_available:
-        print("✓ Image AI detector loaded")
+        print("✓ Image AI detector available (model loads on first use)")
     else:
         print("⚠ Image detector not found. Install: pip install transformers torch pillow timm")
+
+
+def print_batch_line(result: Dict):
+    """
+    Print a one-line result for batch mode
+    
+    Args:
+        result: Analysis result dictionary
+    """
+    verdict = result.get("final_verdict") or "unknown"
+    confidence = result.get("confidence") or "-"
+    print(f"{verdict:<26} {confidence:<12} {result['file']}", flush=True)
+
+
+def print_batch_summary(summary: Dict):
+    """
+    Print the end-of-run summary for batch mode
+    
+    Args:
+        summary: Summary from BatchStats.summary()
+    """
+    print("\n" + "="*60)
+    print(f"Files analyzed: {summary['files']}")
+    print(f"Elapsed: {summary['elapsed_seconds']:.2f}s ({summary['files_per_second']:.2f} files/s)")
+    for verdict, count in summary["verdicts"].items():
+        print(f"   {verdict}: {count}")
+    print("="*60 + "\n")
@@ -0,0 +1,378 @@
+#!/usr/bin/env python3
+"""
+Offline benchmark suite for every detection layer
+Times platform detection, marker search, C2PA parsing, the AI model,
+analyze_file and the API routes, and compares runs against a baseline
+"""
+import os
+import sys
+import json
+import time
+import struct
+import zlib
+import random
+import argparse
+import platform
+import tempfile
+import tracemalloc
+from pathlib import Path
+
+# Add parent directory to path so we can import src
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.core.c2pa_reader import C2PAReader
+from src.core.detector import AIContentDetector
+from src.core.locator import manifest_region, png_chunk, sniff_mime_type
+from src.platforms.registry import PlatformRegistry
+
+EXAMPLES_DIR = Path(__file__).resolve().parent.parent / "examples"
+MEDIA_EXTENSIONS = {".png", ".jpg", ".jpeg", ".webp", ".mp4", ".mov"}
+
+BENCHMARKS = ["detect_platform", "search_raw_data", "c2pa_read", "c2pa_validate",
+              "image_detect", "analyze_file", "api_validate_file", "api_validate_raw"]
+
+
+def percentile(samples, fraction):
+    """Linear-interpolated percentile of sorted samples"""
+    if not samples:
+        return 0.0
+    position = (len(samples) - 1) * fraction
+    low = int(position)
+    high = min(low + 1, len(samples) - 1)
+    return samples[low] + (samples[high] - samples[low]) * (position - low)
+
+
+def run_benchmark(ops, iterations, warmup=1):
+    """
+    Time a list of operations
+    
+    Every operation runs once per iteration after warmup passes. Peak
+    Python memory is measured in a separate pass so tracemalloc does not
+    slow down the timed runs.
+    
+    Args:
+        ops: List of zero-argument callables (one per input)
+        iterations: Timed passes over ops
+        warmup: Untimed passes first (loads models, fills caches)
+        
+    Returns:
+        Dict with latency percentiles (ms), throughput and peak memory
+    """
+    for _ in range(warmup):
+        for op in ops:
+            op()
+            
+    samples = []
+    started = time.perf_counter()
+    for _ in range(iterations):
+        for op in ops:
+            t0 = time.perf_counter()
+            op()
+            samples.append(time.perf_counter() - t0)
+    elapsed = time.perf_counter() - started
+    
+    tracemalloc.start()
+    try:
+        for op in ops:
+            op()
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+        
+    samples.sort()
+    ms = [s * 1000 for s in samples]
+    return {
+        "count": len(ms),
+        "mean_ms": round(sum(ms) / len(ms), 4) if ms else 0.0,
+        "min_ms": round(ms[0], 4) if ms else 0.0,
+        "p50_ms": round(percentile(ms, 0.50), 4),
+        "p95_ms": round(percentile(ms, 0.95), 4),
+        "p99_ms": round(percentile(ms, 0.99), 4),
+        "max_ms": round(ms[-1], 4) if ms else 0.0,
+        "ops_per_second": round(len(ms) / elapsed, 2) if elapsed > 0 else 0.0,
+        "peak_memory_kib": round(peak / 1024, 1)
+    }
+
+
+def generate_inputs(directory, large_mb=32, seed=0):
+    """
+    Write generated inputs for scale cases the examples do not cover
+    
+    Args:
+        directory: Where to write the files
+        large_mb: Padding added to the large video (0 skips it)
+        seed: Random seed for the noise image
+        
+    Returns:
+        List of file paths
+    """
+    paths = []
+    rng = random.Random(seed)
+    
+    # 1024x1024 RGB noise PNG without a manifest (prefilter and Layer-3 path)
+    width = height = 1024
+    rows = b"".join(b"\x00" + rng.randbytes(width * 3) for _ in range(height))
+    png = (b"\x89PNG\r\n\x1a\n"
+           + png_chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0))
+           + png_chunk(b"IDAT", zlib.compress(rows, 1))
+           + png_chunk(b"IEND", b""))
+    path = os.path.join(directory, "generated_noise_1024.png")
+    with open(path, "wb") as f:
+        f.write(png)
+    paths.append(path)
+    
+    # Example video padded with a large trailing free box (payload skipping)
+    video = EXAMPLES_DIR / "videotest.mp4"
+    if large_mb and video.exists():
+        path = os.path.join(directory, f"generated_videotest_{large_mb}mb.mp4")
+        padding = large_mb * 1024 * 1024
+        with open(path, "wb") as f:
+            f.write(video.read_bytes())
+            f.write(struct.pack(">I", padding + 8) + b"free")
+            chunk = b"\x00" * (1024 * 1024)
+            for _ in range(large_mb):
+                f.write(chunk)
+        paths.append(path)
+        
+    return paths
+
+
+def collect_inputs(inputs):
+    """Expand files and directories into media file paths"""
+    paths = []
+    for item in inputs:
+        if os.path.isdir(item):
+            for name in sorted(os.listdir(item)):
+                if os.path.splitext(name)[1].lower() in MEDIA_EXTENSIONS:
+                    paths.append(os.path.join(item, name))
+        elif os.path.isfile(item):
+            paths.append(item)
+    return paths
+
+
+def build_benchmarks(paths, selected):
+    """
+    Prepare the operations of every selected benchmark
+    
+    Returns:
+        Tuple of ({name: ops}, {name: reason skipped}, cleanup callables)
+    """
+    benches = {}
+    skipped = {}
+    cleanup = []
+    
+    registry = PlatformRegistry()
+    reader = C2PAReader()
+    datas = {path: Path(path).read_bytes() for path in paths}
+    
+    if "detect_platform" in selected or "search_raw_data" in selected:
+        regions = {}
+        manifests = {}
+        for path, data in datas.items():
+            regions[path] = bytes(manifest_region(data))
+            with reader.open_session(path) as session:
+                manifests[path] = session.manifest
+                
+        if "detect_platform" in selected:
+            benches["detect_platform"] = [
+                (lambda m=manifests[p], r=regions[p]: registry.detect_platform(m, r))
+                for p in paths
+            ]
+        if "search_raw_data" in selected:
+            # Every extractor over the whole file, as the fallback path does
+            benches["search_raw_data"] = [
+                (lambda d=datas[p]: [e.search_raw_data(d) for e in registry.extractors.values()])
+                for p in paths
+            ]
+            
+    if "c2pa_read" in selected or "c2pa_validate" in selected:
+        if not reader.is_available():
+            for name in ("c2pa_read", "c2pa_validate"):
+                if name in selected:
+                    skipped[name] = "c2pa library not installed"
+        else:
+            def read(path):
+                with reader.open_session(path) as session:
+                    return session.manifest
+            
+            def validate(path):
+                with reader.open_session(path) as session:
+                    return session.validate_signature()
+                    
+            if "c2pa_read" in selected:
+                benches["c2pa_read"] = [(lambda p=p: read(p)) for p in paths]
+            if "c2pa_validate" in selected:
+                benches["c2pa_validate"] = [(lambda p=p: validate(p)) for p in paths]
+                
+    if "image_detect" in selected or "analyze_file" in selected:
+        detector = AIContentDetector(in_process=True)
+        
+        if "image_detect" in selected:
+            images = [p for p in paths if sniff_mime_type(datas[p][:32]) in
+                      ("image/png", "image/jpeg", "image/webp")]
+            if not detector.image_detector.is_available():
+                skipped["image_detect"] = "transformers/torch/PIL not installed"
+            elif not images:
+                skipped["image_detect"] = "no image inputs"
+            else:
+                benches["image_detect"] = [
+                    (lambda p=p: detector.image_detector.detect(p)) for p in images
+                ]
+        if "analyze_file" in selected:
+            benches["analyze_file"] = [(lambda p=p: detector.analyze_file(p)) for p in paths]
+            
+    api_routes = [name for name in ("api_validate_file", "api_validate_raw") if name in selected]
+    if api_routes:
+        try:
+            from fastapi.testclient import TestClient
+            from src.api.server import create_app
+            from src.api.routes import setup_routes
+        except ImportError as e:
+            for name in api_routes:
+                skipped[name] = f"API dependencies not installed ({e})"
+        else:
+            app = create_app()
+            setup_routes(app)
+            client = TestClient(app)
+            client.__enter__()
+            cleanup.append(lambda: client.__exit__(None, None, None))
+            
+            def post_file(path):
+                response = client.post("/validate/file",
+                                       files={"file": (os.path.basename(path), datas[path])})
+                response.raise_for_status()
+            
+            def post_raw(path):
+                response = client.post("/validate/raw", content=datas[path])
+                response.raise_for_status()
+                
+            if "api_validate_file" in selected:
+                benches["api_validate_file"] = [(lambda p=p: post_file(p)) for p in paths]
+            if "api_validate_raw" in selected:
+                benches["api_validate_raw"] = [(lambda p=p: post_raw(p)) for p in paths]
+                
+    return benches, skipped, cleanup
+
+
+def compare(results, baseline, threshold):
+    """
+    Compare benchmark results against a baseline run
+    
+    A benchmark regresses when its p50 or p95 grew by more than threshold
+    (a fraction, e.g. 0.10 for 10%).
+    
+    Returns:
+        Dict with per-benchmark ratios and the list of regressions
+    """
+    comparison = {"threshold": threshold, "benchmarks": {}, "regressions": []}
+    base = baseline.get("benchmarks", {})
+    
+    for name, current in results.items():
+        previous = base.get(name)
+        if not previous:
+            continue
+        entry = {}
+        for key in ("p50_ms", "p95_ms", "p99_ms", "ops_per_second", "peak_memory_kib"):
+            if previous.get(key):
+                entry[key] = round(current[key] / previous[key], 3)
+        comparison["benchmarks"][name] = entry
+        
+        if any(entry.get(key, 0) > 1 + threshold for key in ("p50_ms", "p95_ms")):
+            comparison["regressions"].append(name)
+            
+    return comparison
+
+
+def parse_args():
+    """Parse command line arguments"""
+    parser = argparse.ArgumentParser(
+        description="Benchmark every detection layer offline",
+        epilog="Examples:\n"
+               "  python tools/benchmark.py --output baseline.json\n"
+               "  python tools/benchmark.py --baseline baseline.json --threshold 0.15\n"
+               "  python tools/benchmark.py --only detect_platform,c2pa_read --iterations 50",
+        formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("inputs", nargs="*", help=f"Files or directories (default: {EXAMPLES_DIR.name}/)")
+    parser.add_argument("-n", "--iterations", type=int, default=10, help="Timed passes over the inputs (default: 10)")
+    parser.add_argument("--warmup", type=int, default=1, help="Untimed passes first (default: 1)")
+    parser.add_argument("--only", metavar="NAMES", help="Comma-separated benchmarks: " + ", ".join(BENCHMARKS))
+    parser.add_argument("--no-generated", action="store_true", help="Skip generated inputs")
+    parser.add_argument("--large-mb", type=int, default=32, help="Padding of the generated large video (default: 32)")
+    parser.add_argument("--output", metavar="JSON", help="Write results here (default: stdout)")
+    parser.add_argument("--baseline", metavar="JSON", help="Compare against a saved run; exit 1 on regression")
+    parser.add_argument("--threshold", type=float, default=0.10, help="Allowed p50/p95 slowdown vs baseline (default: 0.10)")
+    return parser.parse_args()
+
+
+def main():
+    """Run the benchmarks"""
+    args = parse_args()
+    selected = args.only.split(",") if args.only else BENCHMARKS
+    unknown = [name for name in selected if name not in BENCHMARKS]
+    if unknown:
+        print(f"Unknown benchmarks: {', '.join(unknown)}", file=sys.stderr)
+        sys.exit(2)
+        
+    with tempfile.TemporaryDirectory(prefix="c2pa-bench-") as workdir:
+        paths = collect_inputs(args.inputs or [str(EXAMPLES_DIR)])
+        if not args.no_generated:
+            paths += generate_inputs(workdir, large_mb=args.large_mb)
+        if not paths:
+            print("No input files", file=sys.stderr)
+            sys.exit(2)
+            
+        benches, skipped, cleanup = build_benchmarks(paths, selected)
+        
+        results = {}
+        try:
+            for name in selected:
+                if name not in benches:
+                    continue
+                print(f"Running {name} ({len(benches[name])} inputs x {args.iterations})...", file=sys.stderr)
+                results[name] = run_benchmark(benches[name], args.iterations, args.warmup)
+        finally:
+            for close in cleanup:
+                close()
+                
+        report = {
+            "meta": {
+                "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+                "cpus": os.cpu_count(),
+                "iterations": args.iterations,
+                "inputs": [{"name": os.path.basename(p), "bytes": os.path.getsize(p)} for p in paths]
+            },
+            "benchmarks": results,
+            "skipped": skipped
+        }
+        
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            report["comparison"] = compare(results, json.load(f), args.threshold)
+            
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(output + "\n")
+    else:
+        print(output)
+        
+    # Human-readable summary on stderr
+    print(f"\n{'benchmark':<20} {'p50 ms':>10} {'p95 ms':>10} {'p99 ms':>10} {'ops/s':>10} {'peak KiB':>10}",
+          file=sys.stderr)
+    for name, stats in results.items():
+        print(f"{name:<20} {stats['p50_ms']:>10.3f} {stats['p95_ms']:>10.3f} {stats['p99_ms']:>10.3f} "
+              f"{stats['ops_per_second']:>10.1f} {stats['peak_memory_kib']:>10.1f}", file=sys.stderr)
+    for name, reason in skipped.items():
+        print(f"{name:<20} skipped: {reason}", file=sys.stderr)
+        
+    regressions = report.get("comparison", {}).get("regressions", [])
+    if regressions:
+        print(f"\nRegressions over {args.threshold:.0%}: {', '.join(regressions)}", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -3,10 +3,16 @@
 Extract C2PA data even with invalid signatures
 Uses raw JUMBF box reading
 """
+import os
 import sys
 import struct
 from pathlib import Path
 
+# Add parent directory to path so we can import src
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.core.locator import locate_manifest
+
 def find_jumbf_box(data):
     """Find JUMBF box in image data"""
     # Look for JUMBF signature
@@ -16,11 +22,18 @@ def find_jumbf_box(data):
         b'urn:c2pa',  # C2PA URN
     ]
     
+    # Only search the manifest store when the container can be walked
+    ranges = locate_manifest(data)
+    if ranges is None:
+        ranges = [(0, len(data))]
+    
     positions = []
     for marker in jumbf_markers:
-        pos = data.find(marker)
-        if pos != -1:
-            positions.append((marker, pos))
+        for start, end in ranges:
+            pos = data.find(marker, start, end)
+            if pos != -1:
+                positions.append((marker, pos))
+                break
     
     return positions
 
@@ -0,0 +1,385 @@
+#!/usr/bin/env python3
+"""
+Generate a synthetic C2PA corpus for scale and load testing
+Writes PNG, JPEG, WebP and MP4 files carrying fake JUMBF manifest stores
+with platform markers (or no manifest), plus an index of expected results
+"""
+import io
+import os
+import sys
+import json
+import struct
+import zlib
+import random
+import argparse
+import itertools
+
+# Add parent directory to path so we can import src
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.core.locator import C2PA_UUID, png_chunk
+
+FORMATS = ["png", "jpeg", "webp", "mp4"]
+PLATFORMS = ["openai", "google", "adobe", "microsoft", "none"]
+POSITIONS = ["start", "end"]
+EXTENSIONS = {"png": ".png", "jpeg": ".jpg", "webp": ".webp", "mp4": ".mp4"}
+
+# JUMBF description type of a C2PA manifest store ("c2pa" + ISO suffix)
+C2PA_STORE_TYPE = bytes.fromhex("6332706100110010800000aa00389b71")
+C2MA_TYPE = bytes.fromhex("63326d6100110010800000aa00389b71")
+JSON_TYPE = bytes.fromhex("6a736f6e00110010800000aa00389b71")
+
+# What each platform writes into its claims
+PLATFORM_CLAIMS = {
+    "openai": {
+        "claim_generator": "ChatGPT",
+        "software_agent": "GPT-4o",
+        "issuer": "OpenAI",
+        "signer": "Truepic Lens CLI in Sora"
+    },
+    "google": {
+        "claim_generator": "Google Media Processing Services",
+        "software_agent": "Gemini",
+        "issuer": "Google LLC",
+        "signer": "Google Media Processing Services"
+    },
+    "adobe": {
+        "claim_generator": "Adobe Firefly",
+        "software_agent": "Adobe Firefly",
+        "issuer": "Adobe Inc.",
+        "signer": "Adobe Content Credentials"
+    },
+    "microsoft": {
+        "claim_generator": "Microsoft Designer",
+        "software_agent": "Bing Image Creator",
+        "issuer": "Microsoft Corporation",
+        "signer": "Microsoft Copilot"
+    }
+}
+
+# Largest JUMBF payload per JPEG APP11 segment (65535 minus length, CI, En, Z)
+JPEG_SEGMENT_PAYLOAD = 65535 - 2 - 8
+
+
+def box(box_type, payload):
+    """Encode one ISO-BMFF box, 64-bit size when needed (JUMBF uses the same layout)"""
+    if len(payload) + 8 > 0xFFFFFFFF:
+        return struct.pack(">I4sQ", 1, box_type, len(payload) + 16) + payload
+    return struct.pack(">I4s", len(payload) + 8, box_type) + payload
+
+
+def jumbf_superbox(type_uuid, label, children):
+    """Encode a JUMBF superbox: description box plus content boxes"""
+    description = box(b"jumd", type_uuid + b"\x03" + label.encode("utf-8") + b"\x00")
+    return box(b"jumb", description + b"".join(children))
+
+
+def fake_manifest_store(platform, title, size=0, extra_markers=(), rng=None):
+    """
+    Build a fake C2PA manifest store
+    
+    The store has the real JUMBF layout (store superbox, manifest
+    superbox, JSON claim) so container walkers find it, but the claim is
+    not CBOR and the signature is random bytes: the c2pa library rejects
+    it and detection has to come from the raw platform markers.
+    
+    Args:
+        platform: Key of PLATFORM_CLAIMS
+        title: Claim title (usually the file name)
+        size: Pad the store to at least this many bytes
+        extra_markers: More strings to write into the claim
+        rng: random.Random for the fake signature
+        
+    Returns:
+        JUMBF bytes
+    """
+    rng = rng or random.Random()
+    info = PLATFORM_CLAIMS[platform]
+    label = "urn:uuid:" + "%032x" % rng.getrandbits(128)
+    claim = {
+        "claim_generator": info["claim_generator"],
+        "claim_generator_info": [{"name": info["claim_generator"], "version": "1.0"}],
+        "title": title,
+        "assertions": [{
+            "label": "c2pa.actions",
+            "data": {"actions": [{
+                "action": "c2pa.created",
+                "softwareAgent": info["software_agent"],
+                "digitalSourceType": "http://cv.iptc.org/newscodes/digitalsourcetype/trainedAlgorithmicMedia"
+            }]}
+        }],
+        "signature_info": {"issuer": info["issuer"], "common_name": info["signer"]},
+        "markers": list(extra_markers)
+    }
+    claim_box = jumbf_superbox(JSON_TYPE, "c2pa.claim",
+                               [box(b"json", json.dumps(claim).encode("utf-8"))])
+    signature = box(b"uuid", rng.randbytes(16 + 256))
+    manifest = jumbf_superbox(C2MA_TYPE, label, [claim_box, signature])
+    
+    store = jumbf_superbox(C2PA_STORE_TYPE, "c2pa", [manifest])
+    if len(store) < size:
+        # Padding box inside the manifest keeps the store well-formed
+        padding = box(b"free", b"\x00" * max(0, size - len(store) - 8))
+        store = jumbf_superbox(C2PA_STORE_TYPE, "c2pa", [manifest, padding])
+    return store
+
+
+def noise_pixels(width, height, rng):
+    """Random RGB pixels (incompressible, so file size tracks dimensions)"""
+    return rng.randbytes(width * height * 3)
+
+
+def make_png(width, height, store, position, rng):
+    """PNG with the store in a 'caBX' chunk before (start) or after (end) the image data"""
+    pixels = noise_pixels(width, height, rng)
+    stride = width * 3
+    rows = b"".join(b"\x00" + pixels[y * stride:(y + 1) * stride] for y in range(height))
+    
+    chunks = [png_chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0))]
+    manifest = [png_chunk(b"caBX", store)] if store else []
+    image = [png_chunk(b"IDAT", zlib.compress(rows, 1))]
+    chunks += manifest + image if position == "start" else image + manifest
+    return b"\x89PNG\r\n\x1a\n" + b"".join(chunks) + png_chunk(b"IEND", b"")
+
+
+def _pil_image(width, height, rng):
+    """Noise image through PIL (imported here so PNG/MP4 work without it)"""
+    from PIL import Image
+    
+    return Image.frombytes("RGB", (width, height), noise_pixels(width, height, rng))
+
+
+def make_jpeg(width, height, store, position, rng, quality=90):
+    """
+    JPEG with the store in APP11 segments
+    
+    APP11 must precede the scan data, so "start" puts it right after SOI
+    and "end" right before SOS. Stores over 64 KB are split across
+    segments the way the C2PA spec describes (superbox header repeated).
+    """
+    buffer = io.BytesIO()
+    _pil_image(width, height, rng).save(buffer, "JPEG", quality=quality)
+    data = buffer.getvalue()
+    if not store:
+        return data
+        
+    segments = []
+    header = store[:8]
+    sequence = 1
+    first = store[:JPEG_SEGMENT_PAYLOAD]
+    rest = store[JPEG_SEGMENT_PAYLOAD:]
+    for piece in [first] + [rest[i:i + JPEG_SEGMENT_PAYLOAD - 8]
+                            for i in range(0, len(rest), JPEG_SEGMENT_PAYLOAD - 8)]:
+        payload = piece if sequence == 1 else header + piece
+        content = b"JP" + struct.pack(">HI", 1, sequence) + payload
+        segments.append(b"\xff\xeb" + struct.pack(">H", len(content) + 2) + content)
+        sequence += 1
+    app11 = b"".join(segments)
+    
+    if position == "start":
+        return data[:2] + app11 + data[2:]
+    sos = _jpeg_sos_offset(data)
+    return data[:sos] + app11 + data[sos:]
+
+
+def _jpeg_sos_offset(data):
+    """Offset of the start-of-scan marker, walking the segment headers"""
+    pos = 2
+    while data[pos + 1] != 0xDA:
+        pos += 2 + struct.unpack_from(">H", data, pos + 2)[0]
+    return pos
+
+
+def make_webp(width, height, store, position, rng, quality=90):
+    """
+    WebP with the store in a 'C2PA' chunk
+    
+    The file is converted to the extended (VP8X) layout, which allows
+    extra chunks; "start" puts the manifest before the image data and
+    "end" after it.
+    """
+    buffer = io.BytesIO()
+    _pil_image(width, height, rng).save(buffer, "WEBP", quality=quality)
+    data = buffer.getvalue()
+    if not store:
+        return data
+        
+    image = data[12:]
+    if image[:4] == b"VP8X":
+        header_length = 8 + struct.unpack_from("<I", image, 4)[0]
+        vp8x, image = image[:header_length], image[header_length:]
+    else:
+        canvas = struct.pack("<I", width - 1)[:3] + struct.pack("<I", height - 1)[:3]
+        vp8x = b"VP8X" + struct.pack("<I", 10) + b"\x00\x00\x00\x00" + canvas
+        
+    manifest = b"C2PA" + struct.pack("<I", len(store)) + store + (b"\x00" if len(store) & 1 else b"")
+    body = vp8x + (manifest + image if position == "start" else image + manifest)
+    return b"RIFF" + struct.pack("<I", len(body) + 4) + b"WEBP" + body
+
+
+def _c2pa_uuid_box(store):
+    """ISO-BMFF 'uuid' box carrying a C2PA manifest store"""
+    # version/flags, purpose, offset of the merkle data (none)
+    payload = C2PA_UUID + b"\x00\x00\x00\x00" + b"manifest\x00" + struct.pack(">Q", 0) + store
+    return box(b"uuid", payload)
+
+
+def write_mp4(path, media_bytes, store, position, rng, chunk_size=1024 * 1024):
+    """
+    Write an MP4 with media_bytes of sample data
+    
+    The manifest 'uuid' box goes after 'ftyp' (start) or after 'mdat'
+    (end, the case of manifests appended to large videos). The sample
+    data is streamed to disk, so multi-gigabyte files need little memory.
+    
+    Returns:
+        File size in bytes
+    """
+    ftyp = box(b"ftyp", b"isom" + struct.pack(">I", 512) + b"isomiso2mp41")
+    # Minimal movie header: 1000 Hz timescale, zero duration, identity matrix
+    mvhd = box(b"mvhd", struct.pack(">I", 0) + struct.pack(">IIII", 0, 0, 1000, 0)
+                     + struct.pack(">IH", 0x00010000, 0x0100) + b"\x00" * 10
+                     + struct.pack(">9I", 0x00010000, 0, 0, 0, 0x00010000, 0, 0, 0, 0x40000000)
+                     + b"\x00" * 24 + struct.pack(">I", 2))
+    moov = box(b"moov", mvhd)
+    manifest = _c2pa_uuid_box(store) if store else b""
+    
+    if media_bytes + 8 > 0xFFFFFFFF:
+        mdat_header = struct.pack(">I4sQ", 1, b"mdat", media_bytes + 16)
+    else:
+        mdat_header = struct.pack(">I4s", media_bytes + 8, b"mdat")
+    block = rng.randbytes(min(chunk_size, media_bytes)) if media_bytes else b""
+    
+    with open(path, "wb") as f:
+        f.write(ftyp)
+        if position == "start":
+            f.write(manifest)
+        f.write(moov)
+        f.write(mdat_header)
+        remaining = media_bytes
+        while remaining > 0:
+            piece = block[:remaining]
+            f.write(piece)
+            remaining -= len(piece)
+        if position == "end":
+            f.write(manifest)
+        return f.tell()
+
+
+def parse_size(text):
+    """Parse WIDTHxHEIGHT"""
+    try:
+        width, height = (int(part) for part in text.lower().split("x"))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected WIDTHxHEIGHT, got {text!r}")
+    if width < 1 or height < 1:
+        raise argparse.ArgumentTypeError(f"dimensions must be positive, got {text!r}")
+    return width, height
+
+
+def parse_list(choices):
+    """Parse a comma-separated subset of choices"""
+    def parse(text):
+        items = [item.strip().lower() for item in text.split(",") if item.strip()]
+        unknown = [item for item in items if item not in choices]
+        if unknown or not items:
+            raise argparse.ArgumentTypeError(f"choose from {', '.join(choices)}")
+        return items
+    return parse
+
+
+def parse_args():
+    """Parse command line arguments"""
+    parser = argparse.ArgumentParser(
+        description="Generate synthetic C2PA test files (fake manifests, offline)",
+        epilog="Examples:\n"
+               "  python tools/generate_c2pa_corpus.py corpus/ --count 1000\n"
+               "  python tools/generate_c2pa_corpus.py corpus/ --formats png,jpeg --size 4096x4096\n"
+               "  python tools/generate_c2pa_corpus.py corpus/ --formats mp4 --video-mb 500 --positions end",
+        formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("output", help="Output directory")
+    parser.add_argument("-n", "--count", type=int, default=100, help="Files to write (default: 100)")
+    parser.add_argument("--formats", type=parse_list(FORMATS), default=FORMATS,
+                        help="Comma-separated: " + ",".join(FORMATS) + " (default: all)")
+    parser.add_argument("--platforms", type=parse_list(PLATFORMS), default=PLATFORMS,
+                        help="Comma-separated: " + ",".join(PLATFORMS) + " ('none' = no manifest, default: all)")
+    parser.add_argument("--positions", type=parse_list(POSITIONS), default=POSITIONS,
+                        help="Manifest before or after the media data: start,end (default: both)")
+    parser.add_argument("--size", type=parse_size, action="append", metavar="WxH",
+                        help="Image dimensions, repeatable (default: 512x512)")
+    parser.add_argument("--video-mb", type=float, action="append", metavar="MB",
+                        help="MP4 sample data size, repeatable (default: 1)")
+    parser.add_argument("--manifest-kb", type=float, default=0,
+                        help="Pad manifest stores to this size (default: no padding)")
+    parser.add_argument("--marker", action="append", default=[], metavar="TEXT",
+                        help="Extra string written into every manifest, repeatable")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed (default: 0)")
+    return parser.parse_args()
+
+
+def main():
+    """Generate the corpus"""
+    args = parse_args()
+    sizes = args.size or [(512, 512)]
+    video_sizes = [int(mb * 1024 * 1024) for mb in (args.video_mb or [1])]
+    
+    formats = list(args.formats)
+    if any(fmt in formats for fmt in ("jpeg", "webp")):
+        try:
+            import PIL  # noqa: F401
+        except ImportError:
+            formats = [fmt for fmt in formats if fmt not in ("jpeg", "webp")]
+            print("Pillow is not installed; skipping JPEG and WebP", file=sys.stderr)
+            if not formats:
+                sys.exit(1)
+                
+    os.makedirs(args.output, exist_ok=True)
+    rng = random.Random(args.seed)
+    
+    # Cycle through every combination so small corpora still cover them all
+    combos = itertools.cycle(itertools.product(formats, args.platforms, args.positions))
+    index = []
+    width_digits = len(str(max(args.count - 1, 0)))
+    
+    for number in range(args.count):
+        fmt, platform, position = next(combos)
+        name = f"{number:0{width_digits}d}_{fmt}_{platform}_{position}{EXTENSIONS[fmt]}"
+        path = os.path.join(args.output, name)
+        store = None
+        if platform != "none":
+            store = fake_manifest_store(platform, name, size=int(args.manifest_kb * 1024),
+                                        extra_markers=args.marker, rng=rng)
+                                        
+        entry = {"file": name, "format": fmt, "platform": platform,
+                 "position": position if store else None,
+                 "manifest_bytes": len(store) if store else 0}
+                 
+        if fmt == "mp4":
+            media_bytes = rng.choice(video_sizes)
+            entry["bytes"] = write_mp4(path, media_bytes, store, position, rng)
+            entry["media_bytes"] = media_bytes
+        else:
+            width, height = rng.choice(sizes)
+            maker = {"png": make_png, "jpeg": make_jpeg, "webp": make_webp}[fmt]
+            data = maker(width, height, store, position, rng)
+            with open(path, "wb") as f:
+                f.write(data)
+            entry["bytes"] = len(data)
+            entry["width"] = width
+            entry["height"] = height
+            
+        index.append(entry)
+        if (number + 1) % 100 == 0:
+            print(f"  {number + 1}/{args.count} files", file=sys.stderr)
+            
+    with open(os.path.join(args.output, "index.json"), "w", encoding="utf-8") as f:
+        json.dump({"seed": args.seed, "count": len(index), "files": index}, f, indent=2)
+        
+    total = sum(entry["bytes"] for entry in index)
+    print(f"Wrote {len(index)} files ({total / (1024 * 1024):.1f} MB) to {args.output}")
+    print(f"Expected results: {os.path.join(args.output, 'index.json')}")
+
+
+if __name__ == "__main__":
+    main()